@@ -0,0 +1,17 @@
+"""
+Shared environment configuration for the chat, cleanup and deployment scripts.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables once per process, however many scripts import this
+if not os.environ.get("_RAGAGENT_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_RAGAGENT_ENV_LOADED"] = "1"
+
+# Configuration from environment variables
+PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023")
+LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
+STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
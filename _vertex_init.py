@@ -0,0 +1,26 @@
+"""
+Shared Vertex AI initialization for the chat, cleanup and deployment scripts.
+"""
+
+import functools
+
+from _config import LOCATION, PROJECT_ID, STAGING_BUCKET
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_vertex():
+    """Initialize Vertex AI with project settings, at most once per process."""
+    # Imported here so the heavy SDK import is skipped until it is needed
+    import vertexai
+
+    print("Initializing Vertex AI...")
+    print(f"Project ID: {PROJECT_ID}")
+    print(f"Location: {LOCATION}")
+    print(f"Staging Bucket: {STAGING_BUCKET}")
+
+    vertexai.init(
+        project=PROJECT_ID,
+        location=LOCATION,
+        staging_bucket=STAGING_BUCKET,
+    )
+    print("✓ Vertex AI initialized successfully")
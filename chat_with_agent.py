@@ -3,84 +3,202 @@
 Interactive CLI chat with the deployed RAG Agent.
 """
 
+import asyncio
+import concurrent.futures
+import functools
+import math
 import os
 import sys
-import ast
-from dotenv import load_dotenv
-import vertexai
-from vertexai import agent_engines
 
-# Load environment variables
-load_dotenv()
-
-# Configuration from environment variables
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023")
-LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
-STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
+from _vertex_init import ensure_vertex
 
 # Resource name from successful deployment
 AGENT_RESOURCE_NAME = "projects/442235900540/locations/us-central1/reasoningEngines/6196856330238558208"
-def initialize_vertex_ai():
-    """Initialize Vertex AI with project settings."""
-    print("Initializing Vertex AI...")
-    vertexai.init(
-        project=PROJECT_ID,
-        location=LOCATION,
-        staging_bucket=STAGING_BUCKET,
-    )
-    print("✓ Vertex AI initialized")
+
+# Chat session id reused across runs
+SESSION_CACHE_FILE = os.path.expanduser("~/.ragagent_session")
+
+# Prompt history shared across runs
+HISTORY_FILE = os.path.expanduser("~/.ragagent_history")
+
+# Cached handle to the deployed agent, resolved once per process
+_REMOTE_APP = None
 
 def get_deployed_agent():
     """Get the deployed agent using its resource name."""
+    global _REMOTE_APP
+    if _REMOTE_APP is not None:
+        return _REMOTE_APP
+
     try:
+        from vertexai import agent_engines
+
         print("Connecting to deployed RAG agent...")
-        remote_app = agent_engines.get(AGENT_RESOURCE_NAME)
+        _REMOTE_APP = agent_engines.get(AGENT_RESOURCE_NAME)
         print("✓ Connected to deployed agent successfully")
-        return remote_app
+        return _REMOTE_APP
     except Exception as e:
         print(f"❌ Failed to connect to agent: {str(e)}")
         sys.exit(1)
 
+def _load_cached_session_id():
+    """Return the session id saved by a previous run, if any."""
+    try:
+        with open(SESSION_CACHE_FILE) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _save_session_id(session_id):
+    """Persist the session id so the next run can reuse it."""
+    try:
+        with open(SESSION_CACHE_FILE, "w") as f:
+            f.write(session_id)
+    except OSError as e:
+        print(f"⚠️  Could not cache session id: {str(e)}")
+
+def invalidate_cached_session():
+    """Forget the cached session id."""
+    try:
+        os.remove(SESSION_CACHE_FILE)
+    except OSError:
+        pass
+
+def is_session_not_found(error):
+    """Return True if an error means the chat session no longer exists."""
+    message = str(error).lower()
+    return "session" in message and "not found" in message
+
 def create_chat_session(remote_app):
-    """Create a new chat session."""
+    """Reuse the cached chat session or create a new one."""
+    cached_id = _load_cached_session_id()
+    if cached_id:
+        print(f"✓ Reusing chat session: {cached_id}")
+        return {"id": cached_id}
+
     try:
         print("Creating new chat session...")
         session = remote_app.create_session(user_id="interactive_user")
         print(f"✓ Chat session created: {session['id']}")
+        _save_session_id(session["id"])
         return session
     except Exception as e:
         print(f"❌ Failed to create session: {str(e)}")
         sys.exit(1)
 
-def send_query(remote_app, session_id, message):
-    """Send a query to the agent and get the response."""
+# Large chunks are re-sliced so the answer still appears progressively
+MEGA_CHUNK_CHARS = 50
+RECHUNK_SIZE = 4
+RECHUNK_DELAY = 0.02
+RECHUNK_MAX_DELAY = 0.2
+
+async def _write_chunk(text):
+    """Write a streamed text chunk to stdout, pacing out oversized chunks."""
+    if len(text) <= MEGA_CHUNK_CHARS:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+
+    # Spread the slices over at most RECHUNK_MAX_DELAY seconds per chunk by capping
+    # how many there are; shrinking the delay instead would not help, since every
+    # sleep costs about a millisecond however short it is asked to be
+    max_slices = int(RECHUNK_MAX_DELAY / RECHUNK_DELAY)
+    step = max(RECHUNK_SIZE, math.ceil(len(text) / max_slices))
+    for i in range(0, len(text), step):
+        sys.stdout.write(text[i:i + step])
+        sys.stdout.flush()
+        await asyncio.sleep(RECHUNK_DELAY)
+
+# Shared defaults for walking event dicts without extra membership checks
+_EMPTY = {}
+_NOPARTS = ()
+
+# Marks the end of a stream read by the background task
+_STREAM_DONE = object()
+
+async def _read_stream_in_background(response_stream, maxsize=32):
+    """Read stream events in a background task and yield them from a bounded queue.
+
+    Network reads keep going while the caller awaits between printed chunks.
+    Errors raised by the stream are re-raised in the caller once it is drained.
+    """
+    events = asyncio.Queue(maxsize=maxsize)
+    errors = []
+
+    async def produce():
+        try:
+            async for event in response_stream:
+                await events.put(event)
+        except Exception as e:
+            errors.append(e)
+        # Not in a finally block: once the consumer has cancelled this task nobody
+        # reads the queue, and waiting on a full one would never return
+        await events.put(_STREAM_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            event = await events.get()
+            if event is _STREAM_DONE:
+                break
+            yield event
+    finally:
+        producer.cancel()
+
+    if errors:
+        raise errors[0]
+
+def bind_session(remote_app, session_id):
+    """Bind the per-session stream_query arguments once, leaving only the message."""
+    return functools.partial(
+        remote_app.async_stream_query,
+        user_id="interactive_user",
+        session_id=session_id,
+    )
+
+async def send_query(query_fn, message):
+    """Send a query to the agent and yield text deltas as they arrive.
+
+    query_fn is the session-bound stream function returned by bind_session.
+    """
+    response_stream = query_fn(message=message)
+
+    async for event in _read_stream_in_background(response_stream):
+        # The stream yields plain dicts; skip anything else
+        if not isinstance(event, dict):
+            continue
+
+        for part in event.get('content', _EMPTY).get('parts', _NOPARTS):
+            text = part.get('text')
+            if text:
+                yield text
+
+async def print_response(query_fn, message):
+    """Stream the agent's response to stdout and return the full text."""
     try:
         print("\n🤖 Agent is thinking...")
-        response_stream = remote_app.stream_query(
-            user_id="interactive_user",
-            session_id=session_id,
-            message=message,
-        )
-        
-        text_response = ""
-        for event_str in response_stream:
-            try:
-                # Convert the string representation of the event to a dictionary
-                event = ast.literal_eval(str(event_str))
-                
-                # Check if the event has the expected structure
-                if isinstance(event, dict) and 'content' in event and 'parts' in event['content']:
-                    for part in event['content']['parts']:
-                        if 'text' in part:
-                            text_response += part['text']
-            except (ValueError, SyntaxError):
-                # Handle cases where the string is not a valid literal
-                continue
+        sys.stdout.write("\n🤖 Agent: ")
+        sys.stdout.flush()
+
+        parts_buf = []
+        async for delta in send_query(query_fn, message):
+            # Print each chunk as soon as it arrives
+            await _write_chunk(delta)
+            parts_buf.append(delta)
         
-        return text_response if text_response else "No text response found."
+        text_response = "".join(parts_buf)
+        if not text_response:
+            sys.stdout.write("No text response found.")
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return text_response
 
     except Exception as e:
-        return f"❌ Error getting response: {str(e)}"
+        # Let the caller replace a stale cached session
+        if is_session_not_found(e):
+            raise
+        print(f"\n❌ Error getting response: {str(e)}")
+        return ""
 
 def print_welcome():
     """Print welcome message and instructions."""
@@ -114,19 +232,47 @@ def print_help():
     print("• 'Get corpus information'")
     print("="*40)
 
+def load_history():
+    """Enable line editing and load the prompt history, if readline is available."""
+    try:
+        import readline
+    except ImportError:
+        return
+    readline.set_history_length(1000)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except FileNotFoundError:
+        pass
+
+def save_history():
+    """Write the prompt history back to disk."""
+    try:
+        import readline
+        readline.write_history_file(HISTORY_FILE)
+    except (ImportError, OSError):
+        pass
+
 def main():
     """Main interactive chat loop."""
     try:
         # Initialize and connect
-        initialize_vertex_ai()
+        ensure_vertex()
         remote_app = get_deployed_agent()
-        session = create_chat_session(remote_app)
+
+        # Create the session in the background while the user reads the welcome
+        # text and types the first message
+        session_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        session_future = session_executor.submit(create_chat_session, remote_app)
+        session_executor.shutdown(wait=False)
         
         # Print welcome
         print_welcome()
         
-        # Interactive chat loop
-        session_id = session["id"]
+        # Interactive chat loop; one event loop serves the whole session, since the
+        # agent's async streams stay bound to the loop they were first used on
+        query_fn = None
+        loop = asyncio.new_event_loop()
+        load_history()
         
         while True:
             try:
@@ -146,11 +292,20 @@ def main():
                     print("Please enter a message or type 'help' for examples.")
                     continue
                 
-                # Send query to agent
-                response = send_query(remote_app, session_id, user_input)
-                
-                # Display response
-                print(f"\n🤖 Agent: {response}")
+                # Wait for the prefetched session on the first query
+                if query_fn is None:
+                    query_fn = bind_session(remote_app, session_future.result()["id"])
+
+                # Send query to agent; the response is printed while it streams
+                try:
+                    loop.run_until_complete(print_response(query_fn, user_input))
+                except Exception as e:
+                    if not is_session_not_found(e):
+                        raise
+                    print("\n⚠️  Cached chat session expired, creating a new one...")
+                    invalidate_cached_session()
+                    query_fn = bind_session(remote_app, create_chat_session(remote_app)["id"])
+                    loop.run_until_complete(print_response(query_fn, user_input))
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Chat interrupted. Goodbye!")
@@ -158,6 +313,9 @@ def main():
             except Exception as e:
                 print(f"\n❌ Error in chat loop: {str(e)}")
                 continue
+
+        loop.close()
+        save_history()
                 
     except Exception as e:
         print(f"❌ Fatal error: {str(e)}")
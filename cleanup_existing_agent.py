@@ -3,35 +3,11 @@
 Clean up existing agent deployment before deploying the new full RAG version.
 """
 
-import os
-from dotenv import load_dotenv
-import vertexai
-from vertexai import agent_engines
-
-# Load environment variables
-load_dotenv()
-
-# Configuration from environment variables
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023")
-LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
-STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
+from _vertex_init import ensure_vertex
 
 # Existing agent resource name
 EXISTING_AGENT_RESOURCE_NAME = "projects/442235900540/locations/us-central1/reasoningEngines/6606895002561806336"
 
-def initialize_vertex_ai():
-    """Initialize Vertex AI with project settings."""
-    print(f"Initializing Vertex AI...")
-    print(f"Project ID: {PROJECT_ID}")
-    print(f"Location: {LOCATION}")
-    
-    vertexai.init(
-        project=PROJECT_ID,
-        location=LOCATION,
-        staging_bucket=STAGING_BUCKET,
-    )
-    print("✓ Vertex AI initialized successfully")
-
 def cleanup_existing_agent():
     """Clean up the existing simplified agent deployment."""
     print("\n" + "="*50)
@@ -41,6 +17,8 @@ def cleanup_existing_agent():
     print(f"Existing agent resource: {EXISTING_AGENT_RESOURCE_NAME}")
     
     try:
+        from vertexai import agent_engines
+
         # Get the existing remote app
         print("Connecting to existing agent...")
         remote_app = agent_engines.get(EXISTING_AGENT_RESOURCE_NAME)
@@ -62,15 +40,14 @@ def cleanup_existing_agent():
 def main():
     """Main cleanup workflow."""
     try:
-        # Initialize Vertex AI
-        initialize_vertex_ai()
-        
-        # Ask user for confirmation
+        # Ask user for confirmation before loading the Vertex AI SDK
         confirm = input(f"\nAre you sure you want to delete the existing agent?\nResource: {EXISTING_AGENT_RESOURCE_NAME}\n(y/n): ")
         if confirm.lower() != 'y':
             print("Cleanup cancelled by user.")
             return False
         
+        ensure_vertex()
+        
         # Clean up existing agent
         success = cleanup_existing_agent()
         
@@ -7,47 +7,34 @@ for production use.
 """
 
 import os
-from dotenv import load_dotenv
-import vertexai
-from vertexai.preview import reasoning_engines
-from vertexai import agent_engines
+import sys
 
-# Load environment variables
-load_dotenv()
+from _vertex_init import ensure_vertex
 
-# Configuration from environment variables
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023")
-LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
-STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
-
-def initialize_vertex_ai():
-    """Initialize Vertex AI with project settings."""
-    print(f"Initializing Vertex AI...")
-    print(f"Project ID: {PROJECT_ID}")
-    print(f"Location: {LOCATION}")
-    print(f"Staging Bucket: {STAGING_BUCKET}")
-    
-    vertexai.init(
-        project=PROJECT_ID,
-        location=LOCATION,
-        staging_bucket=STAGING_BUCKET,
-    )
-    print("✓ Vertex AI initialized successfully")
-
-def create_deployable_app():
+def create_deployable_app(agent):
     """Create a deployable app from the RAG agent."""
-    from rag_agent.agent import root_agent
+    from vertexai.preview import reasoning_engines
     
     print("Creating deployable app from RAG agent...")
     
     app = reasoning_engines.AdkApp(
-        agent=root_agent,
+        agent=agent,
         enable_tracing=True,
     )
     
     print("✓ Deployable app created successfully")
     return app
 
+def _print_delta(event):
+    """Write only the text parts of a streamed event instead of its full repr."""
+    if not isinstance(event, dict):
+        return
+    for part in event.get("content", {}).get("parts", []):
+        text = part.get("text")
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
 def test_agent_locally(app):
     """Test the agent locally before deployment."""
     print("\nTesting agent locally...")
@@ -64,14 +51,15 @@ def test_agent_locally(app):
         session_id=session.id,
         message="What documents are available in the corpus?",
     ):
-        print(f"Event: {event}")
+        _print_delta(event)
+    print()
     
     print("✓ Local testing completed")
     return session
 
-def deploy_to_agent_engine():
+def deploy_to_agent_engine(agent):
     """Deploy the agent to Vertex AI Agent Engine."""
-    from rag_agent.agent import root_agent
+    from vertexai import agent_engines
     
     print("\n" + "="*50)
     print("DEPLOYING TO VERTEX AI AGENT ENGINE")
@@ -90,12 +78,14 @@ def deploy_to_agent_engine():
         "gitpython",
         "requests",
         "sseclient-py",
+        "numpy",
+        "cachetools",
     ]
     
     print("Requirements being deployed:", requirements)
     
     remote_app = agent_engines.create(
-        agent_engine=root_agent,
+        agent_engine=agent,
         requirements=requirements,
         # Include the current directory so rag_agent module can be found
         extra_packages=["./rag_agent"]
@@ -122,7 +112,8 @@ def test_remote_agent(remote_app):
         session_id=remote_session["id"],
         message="What documents are available in the corpus?",
     ):
-        print(f"Remote event: {event}")
+        _print_delta(event)
+    print()
     
     print("✓ Remote testing completed")
     return remote_session
@@ -130,26 +121,30 @@ def test_remote_agent(remote_app):
 def main():
     """Main deployment workflow."""
     try:
-        # Initialize Vertex AI
-        initialize_vertex_ai()
+        ensure_vertex()
+        # Import after Vertex AI is initialized; importing rag_agent builds the agent
+        from rag_agent.agent import root_agent
         
         # Create deployable app
-        app = create_deployable_app()
+        app = create_deployable_app(root_agent)
         
-        # Test locally first
-        print("\n" + "="*50)
-        print("LOCAL TESTING")
-        print("="*50)
-        local_session = test_agent_locally(app)
+        # Test locally first, unless FAST_DEPLOY is set for scripted deploys
+        if not os.environ.get("FAST_DEPLOY"):
+            print("\n" + "="*50)
+            print("LOCAL TESTING")
+            print("="*50)
+            local_session = test_agent_locally(app)
+        else:
+            print("\nFAST_DEPLOY is set, skipping local testing")
         
         # Ask user if they want to proceed with deployment
-        proceed = input("\nLocal testing completed. Proceed with deployment to Agent Engine? (y/n): ")
+        proceed = input("\nProceed with deployment to Agent Engine? (y/n): ")
         if proceed.lower() != 'y':
             print("Deployment cancelled by user.")
             return
         
         # Deploy to Agent Engine
-        remote_app = deploy_to_agent_engine()
+        remote_app = deploy_to_agent_engine(root_agent)
         
         # Test remote deployment
         print("\n" + "="*50)
@@ -5,11 +5,25 @@ Deploy the RAG Agent to Vertex AI Agent Engine (Standalone Version).
 This version includes all configuration directly without external module dependencies.
 """
 
+import argparse
+import asyncio
+import io
 import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List
 from dotenv import load_dotenv
+from google.adk.agents import Agent
+from google.api_core import exceptions as api_exceptions
+from google.api_core import retry as api_retry
 import vertexai
 from vertexai.preview import reasoning_engines
 from vertexai import agent_engines
+from vertexai import rag
 
 # Load environment variables
 load_dotenv()
@@ -19,80 +33,273 @@ PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023"
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
 STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
 
+# RAG settings, built once at module load since they never change at runtime
+DEFAULT_TOP_K = 10
+DEFAULT_DISTANCE_THRESHOLD = 0.7
+DEFAULT_CHUNK_SIZE = 512
+DEFAULT_CHUNK_OVERLAP = 100
+DEFAULT_EMBEDDING_REQUESTS_PER_MIN = 1000
+
+# Hardcoded corpus resource name
+_CORPUS = "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
+_RAG_RESOURCES = [rag.RagResource(rag_corpus=_CORPUS)]
+_RETRIEVAL_CFG = rag.RagRetrievalConfig(
+    top_k=DEFAULT_TOP_K,
+    filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
+)
+
+# Chunking configuration for imported documents
+_TRANSFORM_CFG = rag.TransformationConfig(
+    chunking_config=rag.ChunkingConfig(
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        chunk_overlap=DEFAULT_CHUNK_OVERLAP,
+    ),
+)
+
+# LLM parser configuration for imported documents
+PARSER_MODEL_ID = "gemini-2.0-flash"
+PARSER_MODEL_NAME = f"projects/gen-lang-client-0516570023/locations/us-central1/publishers/google/models/{PARSER_MODEL_ID}"
+MAX_PARSING_REQUESTS_PER_MIN = 1000
+
+# Parsing prompt kept in a text file; read once at module load, so the deployed
+# agent is pickled with the string itself
+_PARSING_PROMPT_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "rag_agent", "llm_parser_prompt.txt"
+)
+with open(_PARSING_PROMPT_FILE, encoding="utf-8") as _prompt_file:
+    CUSTOM_PARSING_PROMPT = _prompt_file.read()
+
+_LLM_PARSER_CFG = rag.LlmParserConfig(
+    model_name=PARSER_MODEL_NAME,
+    max_parsing_requests_per_min=MAX_PARSING_REQUESTS_PER_MIN,
+    custom_parsing_prompt=CUSTOM_PARSING_PROMPT,
+)
+
+# Errors worth retrying: rate limiting and transient unavailability
+_RETRYABLE = (api_exceptions.ResourceExhausted, api_exceptions.ServiceUnavailable)
+
+def _is_retryable(exc):
+    """Match retryable errors, including ones vertexai.rag re-raises as RuntimeError."""
+    return isinstance(exc, _RETRYABLE) or isinstance(exc.__cause__, _RETRYABLE)
+
+# Retry imports on retryable errors with exponential backoff (1s, 2s, 4s, ...
+# capped at 32s), giving up after two minutes
+_IMPORT_RETRY = api_retry.Retry(
+    predicate=_is_retryable,
+    initial=1.0,
+    multiplier=2.0,
+    maximum=32.0,
+    timeout=120.0,
+)
+
+@_IMPORT_RETRY
+def _import_files(paths):
+    """Import paths into the corpus, retrying transient failures."""
+    return rag.import_files(
+        _CORPUS,
+        paths,
+        transformation_config=_TRANSFORM_CFG,
+        llm_parser=_LLM_PARSER_CFG,
+        max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
+    )
+
+# Google Docs/Drive URL patterns used to validate add_data_tool paths
+_DOCS_RE = re.compile(r'https://docs\.google\.com/(?:document|spreadsheets|presentation)/d/([a-zA-Z0-9-_]+)')
+_DRIVE_RE = re.compile(r'https://drive\.google\.com/file/d/[a-zA-Z0-9-_]+')
+
+# Longest query text sent for embedding; longer queries are cut at a word boundary
+MAX_QUERY_CHARS = 2048
+
+def _prepare_query(query):
+    """Collapse whitespace in a query and cap its length.
+
+    Returns the prepared query and whether it had to be truncated.
+    """
+    query = " ".join(query.split())
+    if len(query) <= MAX_QUERY_CHARS:
+        return query, False
+    truncated = query[:MAX_QUERY_CHARS]
+    # Avoid ending on a partial word when there is a space to cut at
+    cut = truncated.rfind(" ")
+    if query[MAX_QUERY_CHARS] != " " and cut > 0:
+        truncated = truncated[:cut]
+    return truncated, True
+
+# Retrieved context attributes as (result key, attribute name, default)
+_CTX_FIELDS = (
+    ("source_uri", "source_uri", ""),
+    ("source_name", "source_display_name", ""),
+    ("text", "text", ""),
+    ("score", "score", 0.0),
+)
+
+# RagFile attributes reported by get_corpus_info_tool
+_FILE_FIELDS = ("display_name", "source_uri", "create_time", "update_time")
+
+def _file_details(rag_file):
+    """Summarize a RagFile as a plain dict of its ID and reported fields."""
+    details = {"file_id": rag_file.name.split("/")[-1]}
+    for field in _FILE_FIELDS:
+        details[field] = str(getattr(rag_file, field, ""))
+    return details
+
+# Maximum delete_file calls in flight for one delete_documents_tool call
+MAX_CONCURRENT_DELETES = 16
+
+# Retrieval result cache settings
+RETRIEVAL_CACHE_MAX_ENTRIES = 512
+RETRIEVAL_CACHE_TTL_SECONDS = 300
+
+@dataclass
+class CacheEntry:
+    """A cached value and the time after which it is stale."""
+    value: object
+    expires_at: float
+
+class RetrievalCache:
+    """Thread-safe LRU cache with a TTL for processed retrieval results and tool responses."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks cannot be pickled; the deployed agent starts with an empty cache
+        return {"maxsize": self.maxsize, "ttl": self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"], state["ttl"])
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry, e.g. after the corpus has changed."""
+        with self._lock:
+            self._entries.clear()
+
+_retrieval_cache = RetrievalCache(RETRIEVAL_CACHE_MAX_ENTRIES, RETRIEVAL_CACHE_TTL_SECONDS)
+
+# get_corpus_info_tool responses, one entry per page; cleared whenever a tool
+# adds or deletes files, with the TTL covering changes made outside this process
+CORPUS_INFO_CACHE_MAX_PAGES = 16
+CORPUS_INFO_CACHE_TTL_SECONDS = 300
+_corpus_info_cache = RetrievalCache(CORPUS_INFO_CACHE_MAX_PAGES, CORPUS_INFO_CACHE_TTL_SECONDS)
+
+def _invalidate_corpus_caches():
+    """Forget cached corpus listings and retrievals after the corpus changes."""
+    _corpus_info_cache.clear()
+    _retrieval_cache.clear()
+
+def _print_block(*lines):
+    """Print several lines with a single write to stdout."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+# Set once vertexai.init has run in this process
+_initialized = False
+
 def initialize_vertex_ai():
-    """Initialize Vertex AI with project settings."""
-    print(f"Initializing Vertex AI...")
-    print(f"Project ID: {PROJECT_ID}")
-    print(f"Location: {LOCATION}")
-    print(f"Staging Bucket: {STAGING_BUCKET}")
+    """Initialize Vertex AI with project settings, at most once per process."""
+    global _initialized
+    if _initialized:
+        return
+
+    _print_block(
+        "Initializing Vertex AI...",
+        f"Project ID: {PROJECT_ID}",
+        f"Location: {LOCATION}",
+        f"Staging Bucket: {STAGING_BUCKET}",
+    )
     
     vertexai.init(
         project=PROJECT_ID,
         location=LOCATION,
         staging_bucket=STAGING_BUCKET,
     )
+    _initialized = True
     print("✓ Vertex AI initialized successfully")
 
+# Initialize at import so the RAG calls made by the tools share one setup
+initialize_vertex_ai()
+
 def create_standalone_rag_agent():
     """Create the standalone RAG agent with all dependencies included."""
     
     print("Creating standalone RAG agent for deployment...")
     
-    from google.adk.agents import Agent
-    from typing import List
-    
     # Import the standalone RAG functionality
-    def rag_query_tool(query: str) -> dict:
-        """Standalone RAG query tool with all configuration included."""
-        try:
-            from vertexai import rag
-            
-            # Configuration constants (included directly)
-            DEFAULT_TOP_K = 10
-            DEFAULT_DISTANCE_THRESHOLD = 0.7
-            
-            # Use the hardcoded corpus resource name
-            corpus_resource_name = "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
-            
-            # Configure retrieval parameters
-            rag_retrieval_config = rag.RagRetrievalConfig(
-                top_k=DEFAULT_TOP_K,
-                filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
+    async def retrieve(query):
+        """Retrieve processed contexts for a prepared query, using the retrieval cache."""
+        # Repeated queries within the TTL are answered from the cache
+        cache_key = (
+            query.lower(),
+            DEFAULT_TOP_K,
+            DEFAULT_DISTANCE_THRESHOLD,
+            _CORPUS,
+        )
+        results = _retrieval_cache.get(cache_key)
+        if results is not None:
+            print(
+                f"Retrieval cache hit: {query} "
+                f"({_retrieval_cache.hits} hits / {_retrieval_cache.misses} misses)"
             )
+            return results
 
-            # Perform the query
-            print(f"Performing RAG query: {query}")
-            response = rag.retrieval_query(
-                rag_resources=[
-                    rag.RagResource(
-                        rag_corpus=corpus_resource_name,
-                    )
-                ],
-                text=query,
-                rag_retrieval_config=rag_retrieval_config,
-            )
+        # Perform the query
+        print(
+            f"Performing RAG query: {query} "
+            f"({_retrieval_cache.hits} hits / {_retrieval_cache.misses} misses)"
+        )
+        response = await asyncio.to_thread(
+            rag.retrieval_query,
+            rag_resources=_RAG_RESOURCES,
+            text=query,
+            rag_retrieval_config=_RETRIEVAL_CFG,
+        )
 
-            # Process the response into a more usable format
-            results = []
-            if hasattr(response, "contexts") and response.contexts:
-                for ctx_group in response.contexts.contexts:
-                    result = {
-                        "source_uri": (
-                            ctx_group.source_uri if hasattr(ctx_group, "source_uri") else ""
-                        ),
-                        "source_name": (
-                            ctx_group.source_display_name
-                            if hasattr(ctx_group, "source_display_name")
-                            else ""
-                        ),
-                        "text": ctx_group.text if hasattr(ctx_group, "text") else "",
-                        "score": ctx_group.score if hasattr(ctx_group, "score") else 0.0,
-                    }
-                    results.append(result)
+        # Process the response into a more usable format
+        results = []
+        if hasattr(response, "contexts") and response.contexts:
+            results = [
+                {key: getattr(ctx, attr, default) for key, attr, default in _CTX_FIELDS}
+                for ctx in response.contexts.contexts
+            ]
+
+        _retrieval_cache.put(cache_key, results)
+        return results
+
+    async def rag_query_tool(query: str) -> dict:
+        """Standalone RAG query tool with all configuration included."""
+        try:
+            query, truncated = _prepare_query(query)
+            results = await retrieve(query)
 
             # If we didn't find any results
             if not results:
-                return {
+                response = {
                     "status": "warning",
                     "message": f"No results found in corpus for query: '{query}'",
                     "query": query,
@@ -100,82 +307,130 @@ def create_standalone_rag_agent():
                     "results": [],
                     "results_count": 0,
                 }
+            else:
+                response = {
+                    "status": "success",
+                    "message": f"Successfully queried corpus",
+                    "query": query,
+                    "corpus_name": "test",
+                    "results": results,
+                    "results_count": len(results),
+                }
 
+            if truncated:
+                response["warning"] = f"Query truncated to {MAX_QUERY_CHARS} characters"
+            return response
+            
+        except Exception as e:
             return {
-                "status": "success",
-                "message": f"Successfully queried corpus",
+                "status": "error",
+                "message": f"Error querying corpus: {str(e)}",
                 "query": query,
                 "corpus_name": "test",
+            }
+    
+    async def rag_multi_query_tool(queries: List[str]) -> dict:
+        """Run several phrasings of a question against the corpus in one call.
+
+        The queries are retrieved concurrently; the combined contexts are
+        deduplicated and ordered from most to least relevant.
+        """
+        try:
+            if not queries or not all(isinstance(query, str) for query in queries):
+                return {
+                    "status": "error",
+                    "message": "Invalid queries: Please provide a list of query strings",
+                    "queries": queries,
+                    "corpus_name": "test",
+                }
+
+            prepared = [_prepare_query(query)[0] for query in queries]
+            per_query_results = await asyncio.gather(*(retrieve(query) for query in prepared))
+
+            # Keep the closest match for each context; scores are vector distances
+            merged = {}
+            for results in per_query_results:
+                for result in results:
+                    key = (result["source_uri"], result["text"])
+                    best = merged.get(key)
+                    if best is None or result["score"] < best["score"]:
+                        merged[key] = result
+            results = sorted(merged.values(), key=lambda result: result["score"])
+
+            if not results:
+                return {
+                    "status": "warning",
+                    "message": f"No results found in corpus for queries: {queries}",
+                    "queries": queries,
+                    "corpus_name": "test",
+                    "results": [],
+                    "results_count": 0,
+                }
+
+            return {
+                "status": "success",
+                "message": f"Successfully queried corpus with {len(queries)} queries",
+                "queries": queries,
+                "corpus_name": "test",
                 "results": results,
                 "results_count": len(results),
             }
-            
+
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Error querying corpus: {str(e)}",
-                "query": query,
+                "queries": queries,
                 "corpus_name": "test",
             }
     
-    def get_corpus_info_tool() -> dict:
-        """Get corpus information standalone."""
+    async def get_corpus_info_tool(page_size: int = 50, page_token: str = "") -> dict:
+        """Get corpus information standalone, one page of files at a time.
+
+        Pass the returned next_page_token back as page_token to get the next page;
+        an empty next_page_token means there are no more files.
+        """
         try:
-            from vertexai import rag
-            
-            # Use the hardcoded corpus resource name
-            corpus_resource_name = "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
-            
+            # Answer from the cache while the corpus is unchanged
+            cache_key = (_CORPUS, page_size, page_token)
+            cached = _corpus_info_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Process file information
             file_details = []
+            next_page_token = ""
+            listed = False
             try:
-                # Get the list of files
-                files = rag.list_files(corpus_resource_name)
-                for rag_file in files:
-                    try:
-                        # Extract the file ID from the name
-                        file_id = rag_file.name.split("/")[-1]
-
-                        file_info = {
-                            "file_id": file_id,
-                            "display_name": (
-                                rag_file.display_name
-                                if hasattr(rag_file, "display_name")
-                                else ""
-                            ),
-                            "source_uri": (
-                                rag_file.source_uri
-                                if hasattr(rag_file, "source_uri")
-                                else ""
-                            ),
-                            "create_time": (
-                                str(rag_file.create_time)
-                                if hasattr(rag_file, "create_time")
-                                else ""
-                            ),
-                            "update_time": (
-                                str(rag_file.update_time)
-                                if hasattr(rag_file, "update_time")
-                                else ""
-                            ),
-                        }
-
-                        file_details.append(file_info)
-                    except Exception:
-                        # Continue to the next file
-                        continue
-            except Exception:
-                # Continue without file details
+                # Fetch only the requested page; the pager's first page is the
+                # response to this call, so no further pages are requested
+                pager = await asyncio.to_thread(
+                    rag.list_files,
+                    _CORPUS,
+                    page_size=page_size,
+                    page_token=page_token or None,
+                )
+                file_details = [_file_details(rag_file) for rag_file in pager.rag_files]
+                next_page_token = pager.next_page_token
+                listed = True
+            except (api_exceptions.GoogleAPIError, RuntimeError):
+                # Continue without file details if the listing call fails;
+                # vertexai.rag re-raises RPC errors as RuntimeError
                 pass
 
-            return {
+            info = {
                 "status": "success",
                 "message": f"Successfully retrieved corpus information",
                 "corpus_name": "test",
                 "corpus_display_name": "test",
                 "file_count": len(file_details),
                 "files": file_details,
+                "next_page_token": next_page_token,
             }
+            # Only cache complete listings, so a failed list_files is retried
+            if listed:
+                _corpus_info_cache.put(cache_key, info)
+            return info
             
         except Exception as e:
             return {
@@ -184,19 +439,9 @@ def create_standalone_rag_agent():
                 "corpus_name": "test",
             }
     
-    def add_data_tool(paths: List[str]) -> dict:
+    async def add_data_tool(paths: List[str]) -> dict:
         """Add data to the corpus standalone."""
         try:
-            from vertexai import rag
-            import re
-            
-            # Configuration constants (included directly)
-            DEFAULT_CHUNK_SIZE = 512
-            DEFAULT_CHUNK_OVERLAP = 100
-            DEFAULT_EMBEDDING_REQUESTS_PER_MIN = 1000
-            PROJECT_ID_CONST = "gen-lang-client-0516570023"
-            LOCATION_CONST = "us-central1"
-            
             # Validate inputs
             if not paths or not all(isinstance(path, str) for path in paths):
                 return {
@@ -217,7 +462,7 @@ def create_standalone_rag_agent():
                     continue
                     
                 # Check if it's a Google Docs/Sheets/Slides URL that needs conversion
-                docs_match = re.search(r'https://docs\.google\.com/(?:document|spreadsheets|presentation)/d/([a-zA-Z0-9-_]+)', path)
+                docs_match = _DOCS_RE.search(path)
                 if docs_match:
                     file_id = docs_match.group(1)
                     drive_url = f"https://drive.google.com/file/d/{file_id}/view"
@@ -226,7 +471,7 @@ def create_standalone_rag_agent():
                     continue
                 
                 # Check if it's already a proper Google Drive URL
-                if re.match(r'https://drive\.google\.com/file/d/[a-zA-Z0-9-_]+', path):
+                if _DRIVE_RE.match(path):
                     validated_paths.append(path)
                     continue
                 
@@ -238,6 +483,12 @@ def create_standalone_rag_agent():
                 # If none of the above, it's invalid
                 invalid_paths.append(path)
 
+            # Drop repeated paths, keeping the first occurrence of each, so the same
+            # document is not parsed and embedded twice
+            unique_paths = list(dict.fromkeys(validated_paths))
+            duplicates_removed = len(validated_paths) - len(unique_paths)
+            validated_paths = unique_paths
+
             if not validated_paths:
                 return {
                     "status": "error",
@@ -247,41 +498,9 @@ def create_standalone_rag_agent():
                     "invalid_paths": invalid_paths,
                 }
 
-            # Use the hardcoded corpus resource name
-            corpus_resource_name = "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
-            
-            # Set up chunking configuration
-            transformation_config = rag.TransformationConfig(
-                chunking_config=rag.ChunkingConfig(
-                    chunk_size=DEFAULT_CHUNK_SIZE,
-                    chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-                ),
-            )
-            
-            # Set up LLM parser configuration
-            MODEL_ID = "gemini-2.0-flash"
-            MODEL_NAME = f"projects/{PROJECT_ID_CONST}/locations/{LOCATION_CONST}/publishers/google/models/{MODEL_ID}"
-            MAX_PARSING_REQUESTS_PER_MIN = 1000
-            CUSTOM_PARSING_PROMPT = """
-You are an expert document processing assistant specializing in extracting and converting PDF content into clean, structured text suitable for Retrieval-Augmented Generation (RAG) systems.
-Your Task
-Extract ALL textual content from the provided PDF document and convert it into clean, well-structured plain text that preserves the semantic meaning and logical flow of information.
-"""
-            
-            llm_parser_config = rag.LlmParserConfig(
-                model_name=MODEL_NAME,
-                max_parsing_requests_per_min=MAX_PARSING_REQUESTS_PER_MIN,
-                custom_parsing_prompt=CUSTOM_PARSING_PROMPT,
-            )
-
             # Import files to the corpus
-            import_result = rag.import_files(
-                corpus_resource_name,
-                validated_paths,
-                transformation_config=transformation_config,
-                llm_parser=llm_parser_config,
-                max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
-            )
+            import_result = await asyncio.to_thread(_import_files, validated_paths)
+            _invalidate_corpus_caches()
 
             # Build the success message
             conversion_msg = ""
@@ -293,6 +512,8 @@ Extract ALL textual content from the provided PDF document and convert it into c
                 "message": f"Successfully added {import_result.imported_rag_files_count} file(s) to corpus{conversion_msg}",
                 "corpus_name": "test",
                 "files_added": import_result.imported_rag_files_count,
+                "files_skipped": import_result.skipped_rag_files_count,
+                "duplicates_removed": duplicates_removed,
                 "paths": validated_paths,
                 "invalid_paths": invalid_paths,
                 "conversions": conversions,
@@ -306,17 +527,13 @@ Extract ALL textual content from the provided PDF document and convert it into c
                 "paths": paths,
             }
     
-    def delete_document_tool(document_id: str) -> dict:
+    async def delete_document_tool(document_id: str) -> dict:
         """Delete document standalone."""
         try:
-            from vertexai import rag
-            
-            # Use the hardcoded corpus resource name
-            corpus_resource_name = "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
-            
             # Delete the document
-            rag_file_path = f"{corpus_resource_name}/ragFiles/{document_id}"
-            rag.delete_file(rag_file_path)
+            rag_file_path = f"{_CORPUS}/ragFiles/{document_id}"
+            await asyncio.to_thread(rag.delete_file, rag_file_path)
+            _invalidate_corpus_caches()
 
             return {
                 "status": "success",
@@ -332,6 +549,38 @@ Extract ALL textual content from the provided PDF document and convert it into c
                 "document_id": document_id,
             }
     
+    async def delete_documents_tool(document_ids: List[str]) -> dict:
+        """Delete several documents from the corpus concurrently."""
+        # Created per call so it belongs to the running event loop
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETES)
+
+        async def delete_one(document_id):
+            async with semaphore:
+                await asyncio.to_thread(rag.delete_file, f"{_CORPUS}/ragFiles/{document_id}")
+
+        results = await asyncio.gather(
+            *(delete_one(document_id) for document_id in document_ids),
+            return_exceptions=True,
+        )
+
+        deleted = []
+        failed = []
+        for document_id, result in zip(document_ids, results):
+            if isinstance(result, Exception):
+                failed.append({"document_id": document_id, "error": str(result)})
+            else:
+                deleted.append(document_id)
+        if deleted:
+            _invalidate_corpus_caches()
+
+        return {
+            "status": "error" if failed and not deleted else "success",
+            "message": f"Deleted {len(deleted)} of {len(document_ids)} document(s) from corpus",
+            "corpus_name": "test",
+            "deleted": deleted,
+            "failed": failed,
+        }
+    
     # Create the standalone RAG agent
     standalone_rag_agent = Agent(
         name="HMKAgent_Standalone",
@@ -339,9 +588,11 @@ Extract ALL textual content from the provided PDF document and convert it into c
         description="Vertex AI RAG Agent - Standalone Version",
         tools=[
             rag_query_tool,
+            rag_multi_query_tool,
             get_corpus_info_tool,
             add_data_tool,
             delete_document_tool,
+            delete_documents_tool,
         ],
         instruction="""
 You are an experienced construction project coordinator with comprehensive access to all project documentation, contracts, plans, reports, and site data. Your role is to help project stakeholders quickly find accurate information and make informed decisions.
@@ -366,11 +617,13 @@ You can access all project documents. When needed, you can also get detailed inf
 
 Available Tools:
 1. rag_query_tool - Query the project document corpus with full RAG functionality
-2. get_corpus_info_tool - Get detailed information about the document corpus including file counts and metadata
-3. add_data_tool - Add new documents to the corpus with proper processing and chunking
-4. delete_document_tool - Delete documents from the corpus
+2. rag_multi_query_tool - Run several differently worded queries against the corpus in a single call
+3. get_corpus_info_tool - Get detailed information about the document corpus including file counts and metadata, one page of files at a time (pass next_page_token back as page_token for more)
+4. add_data_tool - Add new documents to the corpus with proper processing and chunking
+5. delete_document_tool - Delete documents from the corpus
+6. delete_documents_tool - Delete several documents from the corpus in a single call
 
-You must be precise and specific in your answers. You can make multiple queries to the corpus to get the information you need. If you think the fetched information is not enough, you can try to fetch additional information from the documents and attempt to search for more relevant information.
+You must be precise and specific in your answers. You can make multiple queries to the corpus to get the information you need. When you want to search with several different phrasings, pass them all to rag_multi_query_tool in one call instead of calling rag_query_tool repeatedly. If you think the fetched information is not enough, you can try to fetch additional information from the documents and attempt to search for more relevant information.
 
 Remember: Your goal is to be the most knowledgeable and helpful team member anyone could ask for regarding this construction project. You have access to everything - use that capability to provide comprehensive, accurate answers that help people make better decisions and keep the project moving smoothly.
 """
@@ -384,12 +637,14 @@ def deploy_to_agent_engine():
     
     agent = create_standalone_rag_agent()
     
-    print("\n" + "="*50)
-    print("DEPLOYING STANDALONE RAG AGENT TO VERTEX AI AGENT ENGINE")
-    print("="*50)
-    
-    print("Starting deployment with standalone RAG functionality...")
-    print("⚠️  This step may take several minutes to complete...")
+    _print_block(
+        "\n" + "="*50,
+        "DEPLOYING STANDALONE RAG AGENT TO VERTEX AI AGENT ENGINE",
+        "="*50,
+        "",
+        "Starting deployment with standalone RAG functionality...",
+        "⚠️  This step may take several minutes to complete...",
+    )
     
     # Include requirements for standalone RAG functionality
     requirements = [
@@ -420,14 +675,41 @@ def deploy_to_agent_engine():
         traceback.print_exc()
         raise
 
-def test_standalone_rag_agent(remote_app):
-    """Test the deployed standalone agent."""
+def _write_event_text(buf, event):
+    """Write the text parts of a streamed event to buf, skipping everything else."""
+    if not isinstance(event, dict):
+        return
+    for part in event.get("content", {}).get("parts", []):
+        text = part.get("text")
+        if text:
+            buf.write(text)
+
+async def _run_test_query(remote_app, query):
+    """Run one test query on its own session.
+
+    Returns the response text, the number of events streamed and the last event;
+    earlier events are not kept.
+    """
+    session = await asyncio.to_thread(
+        remote_app.create_session, user_id="test_user_standalone"
+    )
+    buf = io.StringIO()
+    event_count = 0
+    last_event = None
+    async for event in remote_app.async_stream_query(
+        user_id="test_user_standalone",
+        session_id=session["id"],
+        message=query,
+    ):
+        event_count += 1
+        last_event = event
+        _write_event_text(buf, event)
+    return buf.getvalue(), event_count, last_event
+
+async def test_standalone_rag_agent(remote_app):
+    """Test the deployed standalone agent, running the test queries concurrently."""
     print("\nTesting deployed standalone agent...")
     
-    # Create a remote session
-    remote_session = remote_app.create_session(user_id="test_user_standalone")
-    print(f"✓ Remote session created: {remote_session['id']}")
-    
     # Test queries on the remote agent
     test_queries = [
         "What washing machines did we use on this project?", 
@@ -436,65 +718,88 @@ def test_standalone_rag_agent(remote_app):
         "What is the project schedule?"
     ]
     
-    for query in test_queries:
-        print(f"\nTesting standalone query: '{query}'")
-        try:
-            response_parts = []
-            for event in remote_app.stream_query(
-                user_id="test_user_standalone",
-                session_id=remote_session["id"],
-                message=query,
-            ):
-                response_parts.append(str(event))
-                
-            # Print a summary of the response
-            print(f"Response received: {len(response_parts)} events")
-            if response_parts:
-                print(f"Sample response: {response_parts[-1][:300]}...")
-                
-        except Exception as e:
-            print(f"Error with query '{query}': {e}")
+    # Each query gets its own session so the runs don't share conversation state
+    results = await asyncio.gather(
+        *(_run_test_query(remote_app, query) for query in test_queries),
+        return_exceptions=True,
+    )
+    
+    for query, result in zip(test_queries, results):
+        lines = [f"\nTesting standalone query: '{query}'"]
+        if isinstance(result, Exception):
+            lines.append(f"Error with query '{query}': {result}")
+        else:
+            # Summarize the response
+            text, event_count, last_event = result
+            lines.append(f"Response received: {event_count} events, {len(text)} characters of text")
+            if text:
+                lines.append(f"Sample response: {text[:300]}...")
+            elif last_event is not None:
+                lines.append(f"Last event: {str(last_event)[:300]}...")
+        _print_block(*lines)
     
     print("✓ Standalone testing completed")
-    return remote_session
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options for the standalone deployment."""
+    parser = argparse.ArgumentParser(
+        description="Deploy the standalone RAG agent to Vertex AI Agent Engine."
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        default=bool(os.environ.get("DEPLOY_YES")),
+        help="deploy without asking for confirmation (or set DEPLOY_YES=1)",
+    )
+    parser.add_argument(
+        "--skip-test",
+        action="store_true",
+        default=bool(os.environ.get("DEPLOY_SKIP_TEST")),
+        help="skip the test queries after deployment (or set DEPLOY_SKIP_TEST=1)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main deployment workflow for standalone functionality."""
+    args = parse_args(argv)
     try:
-        # Initialize Vertex AI
-        initialize_vertex_ai()
-        
-        # Ask user if they want to proceed with standalone deployment
-        proceed = input("\nProceed with standalone RAG deployment to Agent Engine? (y/n): ")
-        if proceed.lower() != 'y':
-            print("Deployment cancelled by user.")
-            return
+        # Ask for confirmation unless --yes was given; without a terminal to ask
+        # on, refuse instead of blocking
+        if not args.yes:
+            if not sys.stdin.isatty():
+                print("Refusing to deploy without confirmation; pass --yes or set DEPLOY_YES=1.")
+                return
+            proceed = input("\nProceed with standalone RAG deployment to Agent Engine? (y/n): ")
+            if proceed.lower() != 'y':
+                print("Deployment cancelled by user.")
+                return
         
         # Deploy to Agent Engine with standalone functionality
         remote_app = deploy_to_agent_engine()
         
         # Test remote deployment
-        print("\n" + "="*50)
-        print("STANDALONE TESTING")
-        print("="*50)
-        remote_session = test_standalone_rag_agent(remote_app)
+        if not args.skip_test:
+            _print_block("\n" + "="*50, "STANDALONE TESTING", "="*50)
+            asyncio.run(test_standalone_rag_agent(remote_app))
         
         # Success message
-        print("\n" + "="*50)
-        print("STANDALONE DEPLOYMENT SUCCESSFUL!")
-        print("="*50)
-        print(f"Your standalone RAG agent is now deployed to Vertex AI Agent Engine.")
-        print(f"Resource name: {remote_app.resource_name}")
-        print("\nStandalone capabilities included:")
-        print("✓ Real corpus querying with retrieval")
-        print("✓ Document management (add/delete)")
-        print("✓ Corpus information access")
-        print("✓ All dependencies included")
-        print("✓ No external module dependencies")
-        print("\nTo interact with your deployed agent, update the resource name in:")
-        print("chat_with_agent.py")
-        print("\nTo clean up resources later, run:")
-        print("remote_app.delete(force=True)")
+        _print_block(
+            "\n" + "="*50,
+            "STANDALONE DEPLOYMENT SUCCESSFUL!",
+            "="*50,
+            "Your standalone RAG agent is now deployed to Vertex AI Agent Engine.",
+            f"Resource name: {remote_app.resource_name}",
+            "\nStandalone capabilities included:",
+            "✓ Real corpus querying with retrieval",
+            "✓ Document management (add/delete)",
+            "✓ Corpus information access",
+            "✓ All dependencies included",
+            "✓ No external module dependencies",
+            "\nTo interact with your deployed agent, update the resource name in:",
+            "chat_with_agent.py",
+            "\nTo clean up resources later, run:",
+            "remote_app.delete(force=True)",
+        )
         
         # Return the remote app for further interaction
         return remote_app
@@ -5,7 +5,11 @@ Manage deployed RAG Agent on Vertex AI Agent Engine.
 This script helps you interact with and manage your deployed agent.
 """
 
+import argparse
+import asyncio
+import io
 import os
+import sys
 from dotenv import load_dotenv
 import vertexai
 from vertexai import agent_engines
@@ -18,6 +22,9 @@ PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gen-lang-client-0516570023"
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
 STAGING_BUCKET = os.environ.get("GOOGLE_CLOUD_STAGING_BUCKET", "gs://rag-agent-bucket-hmk")
 
+# Resource name of the deployed agent, used when --resource-name is not given
+AGENT_RESOURCE_NAME = os.environ.get("AGENT_RESOURCE_NAME", "")
+
 def initialize_vertex_ai():
     """Initialize Vertex AI with project settings."""
     print(f"Initializing Vertex AI...")
@@ -31,26 +38,48 @@ def initialize_vertex_ai():
 def get_agent_by_resource_name(resource_name):
     """Get an existing deployed agent by its resource name."""
     try:
-        # This would typically be done by reconstructing the agent object
-        # You'll need to replace this with the actual resource name from your deployment
         print(f"Connecting to agent: {resource_name}")
-        # Note: You may need to use a different method to reconnect to existing agents
-        # This is a placeholder - check the actual Agent Engine documentation for reconnection
-        return None
+        remote_app = agent_engines.get(resource_name)
+        print("✓ Connected to deployed agent successfully")
+        return remote_app
     except Exception as e:
         print(f"Error connecting to agent: {str(e)}")
         return None
 
+def _write_event_text(out, event):
+    """Write the text parts of a streamed event to out, skipping everything else."""
+    if not isinstance(event, dict):
+        return
+    for part in event.get("content", {}).get("parts", []):
+        text = part.get("text")
+        if text:
+            out.write(text)
+
+async def _run_test_query(remote_app, query):
+    """Run one test query on its own session and return the response text."""
+    test_session = await asyncio.to_thread(remote_app.create_session, user_id="test_manager")
+    buf = io.StringIO()
+    async for event in remote_app.async_stream_query(
+        user_id="test_manager",
+        session_id=test_session["id"],
+        message=query,
+    ):
+        _write_event_text(buf, event)
+    return buf.getvalue()
+
+async def _run_test_queries(remote_app, test_queries):
+    """Run all test queries concurrently, returning the text or an error per query."""
+    return await asyncio.gather(
+        *(_run_test_query(remote_app, query) for query in test_queries),
+        return_exceptions=True,
+    )
+
 def test_agent_queries(remote_app):
     """Test various queries on the deployed agent."""
     print("\n" + "="*50)
     print("TESTING AGENT QUERIES")
     print("="*50)
     
-    # Create a session for testing
-    test_session = remote_app.create_session(user_id="test_manager")
-    session_id = test_session["id"]
-    
     # Test queries
     test_queries = [
         "What documents are available in the corpus?",
@@ -59,17 +88,15 @@ def test_agent_queries(remote_app):
         "How many documents are in the corpus?"
     ]
     
-    for i, query in enumerate(test_queries, 1):
+    # Queries run concurrently, each on its own session; output is printed in order
+    results = asyncio.run(_run_test_queries(remote_app, test_queries))
+    
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
         print(f"\n--- Test Query {i}: {query} ---")
-        try:
-            for event in remote_app.stream_query(
-                user_id="test_manager",
-                session_id=session_id,
-                message=query,
-            ):
-                print(f"Response: {event}")
-        except Exception as e:
-            print(f"Error with query: {str(e)}")
+        if isinstance(result, Exception):
+            print(f"Error with query: {str(result)}")
+        else:
+            print(f"Response: {result or 'No text response found.'}")
         print("-" * 40)
 
 def interactive_chat(remote_app):
@@ -100,22 +127,23 @@ def interactive_chat(remote_app):
                 session_id=session_id,
                 message=user_input,
             ):
-                # Extract text from the event if it contains a text response
-                if isinstance(event, dict) and 'parts' in event:
-                    for part in event['parts']:
-                        if 'text' in part:
-                            print(part['text'], end="")
+                # Print only the text parts of the event as they arrive
+                _write_event_text(sys.stdout, event)
+                sys.stdout.flush()
         except Exception as e:
             print(f"Error: {str(e)}")
         print()  # New line after response
 
-def cleanup_agent(remote_app):
+def cleanup_agent(remote_app, assume_yes=False):
     """Clean up the deployed agent resources."""
     print("\n" + "="*50)
     print("CLEANUP RESOURCES")
     print("="*50)
     
-    confirm = input("Are you sure you want to delete the deployed agent? This cannot be undone. (yes/no): ")
+    if assume_yes:
+        confirm = 'yes'
+    else:
+        confirm = input("Are you sure you want to delete the deployed agent? This cannot be undone. (yes/no): ")
     
     if confirm.lower() == 'yes':
         try:
@@ -127,26 +155,65 @@ def cleanup_agent(remote_app):
     else:
         print("Cleanup cancelled.")
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options for the management script."""
+    parser = argparse.ArgumentParser(
+        description="Manage a RAG agent deployed to Vertex AI Agent Engine."
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["test", "chat", "cleanup"],
+        help="action to run; without one, an interactive menu is shown",
+    )
+    parser.add_argument(
+        "--resource-name",
+        default=AGENT_RESOURCE_NAME,
+        help="deployed agent resource name (or set AGENT_RESOURCE_NAME)",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="delete without asking for confirmation when running cleanup",
+    )
+    return parser.parse_args(argv)
+
+def run_command(command, remote_app, assume_yes=False):
+    """Run one management action against the deployed agent."""
+    if command == "test":
+        test_agent_queries(remote_app)
+    elif command == "chat":
+        interactive_chat(remote_app)
+    elif command == "cleanup":
+        cleanup_agent(remote_app, assume_yes=assume_yes)
+
+def main(argv=None):
     """Main management interface."""
+    args = parse_args(argv)
     initialize_vertex_ai()
     
     print("\n" + "="*50)
     print("RAG AGENT MANAGEMENT INTERFACE")
     print("="*50)
     
-    # You'll need to replace this with your actual deployed agent's resource name
-    resource_name = input("Enter your deployed agent's resource name (from deployment): ").strip()
+    resource_name = args.resource_name
+    if not resource_name and args.command is None:
+        resource_name = input("Enter your deployed agent's resource name (from deployment): ").strip()
     
     if not resource_name:
-        print("Error: Resource name is required")
-        return
+        print("Error: Resource name is required (pass --resource-name or set AGENT_RESOURCE_NAME)")
+        sys.exit(1)
+    
+    remote_app = get_agent_by_resource_name(resource_name)
+    if remote_app is None:
+        sys.exit(1)
     
-    # Note: You may need to adjust this based on how Agent Engine handles reconnection
-    # This is a simplified example
-    print(f"Note: You'll need to implement agent reconnection logic for resource: {resource_name}")
-    print("For now, you can use the remote_app object returned from your deployment script.")
+    # Run a single action when one was given on the command line
+    if args.command is not None:
+        run_command(args.command, remote_app, assume_yes=args.yes)
+        return
     
+    menu_commands = {'1': "test", '2': "chat", '3': "cleanup"}
     while True:
         print("\nWhat would you like to do?")
         print("1. Test agent with sample queries")
@@ -156,15 +223,8 @@ def main():
         
         choice = input("Enter your choice (1-4): ").strip()
         
-        if choice == '1':
-            print("To test queries, you need to pass the remote_app object from your deployment.")
-            # test_agent_queries(remote_app)
-        elif choice == '2':
-            print("To start interactive chat, you need to pass the remote_app object from your deployment.")
-            # interactive_chat(remote_app)
-        elif choice == '3':
-            print("To cleanup, you need to pass the remote_app object from your deployment.")
-            # cleanup_agent(remote_app)
+        if choice in menu_commands:
+            run_command(menu_commands[choice], remote_app)
         elif choice == '4':
             print("Goodbye!")
             break
@@ -172,4 +232,4 @@ def main():
             print("Invalid choice. Please try again.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -5,32 +5,71 @@ A package for interacting with Google Cloud Vertex AI RAG capabilities.
 """
 
 import os
+import threading
 
 import vertexai
-from dotenv import load_dotenv
-from . import agent
 
-# Load environment variables
-load_dotenv()
+# Vertex AI configuration; the accessors load the environment once per process
+from . import config
+
+
+def _warm():
+    """Resolve credentials and load the shared model clients before the first tool call."""
+    try:
+        from vertexai import rag
+
+        from .tools.semantic_cache import get_embedding_model
+        from .tools.speculative_rag_query import get_genai_client
+        from .tools.utils import get_corpus_resource_name
+
+        # A cheap RPC fetches and caches the credentials every later call reuses
+        rag.get_corpus(get_corpus_resource_name())
+        get_embedding_model()
+        get_genai_client()
+    except Exception as e:
+        print(f"Vertex AI warm-up skipped: {str(e)}")
+
+
+_warm_lock = threading.Lock()
+_warm_started = False
 
-# Get Vertex AI configuration from environment
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
-LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
+
+def warm_up():
+    """
+    Start warming up Vertex AI in a background thread, at most once per process.
+
+    Servers call this at startup so the first tool call does not pay for credential
+    and client setup; scripts that only need `root_agent` never make these calls.
+    """
+    global _warm_started
+    with _warm_lock:
+        if not _vertex_ready or _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=_warm, name="rag-agent-warmup", daemon=True).start()
+
+
+# Without a project and location every tool call would only fail after a network
+# timeout, so refuse to load instead
+PROJECT_ID = config.project_id()
+LOCATION = config.location()
 
 # Initialize Vertex AI at package load time
+_vertex_ready = False
 try:
-    if PROJECT_ID and LOCATION:
-        print(f"Initializing Vertex AI with project={PROJECT_ID}, location={LOCATION}")
-        vertexai.init(project=PROJECT_ID, location=LOCATION)
-        print("Vertex AI initialization successful")
-    else:
-        print(
-            f"Missing Vertex AI configuration. PROJECT_ID={PROJECT_ID}, LOCATION={LOCATION}. "
-            f"Tools requiring Vertex AI may not work properly."
-        )
+    print(f"Initializing Vertex AI with project={PROJECT_ID}, location={LOCATION}")
+    vertexai.init(project=PROJECT_ID, location=LOCATION)
+    print("Vertex AI initialization successful")
+    _vertex_ready = True
 except Exception as e:
     print(f"Failed to initialize Vertex AI: {str(e)}")
     print("Please check your Google Cloud credentials and project settings.")
 
 # Import agent after initialization is complete
 from . import agent
+
+# Opt-in warm-up for servers that import the package without going through main(),
+# e.g. `adk web`; it runs after the tool modules are imported
+if os.environ.get("RAGAGENT_WARMUP", "").lower() in ("1", "true", "yes"):
+    warm_up()
+
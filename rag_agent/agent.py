@@ -1,102 +1,60 @@
+import functools
+
 from google.adk.agents import Agent
 
-from .tools.add_data import add_data
-from .tools.delete_document import delete_document
-from .tools.get_corpus_info import get_corpus_info
-from .tools.rag_query import rag_query
+from .prompts import load_prompt
+from .tools import TOOLS
 
-root_agent = Agent(
-    name="HMKAgent",
-    # Using Gemini 2.5 Flash for best performance with RAG operations
-    model="gemini-2.5-flash-preview-04-17",
-    
-    description="Vertex AI RAG Agent",
-    tools=[
-        rag_query,
-        get_corpus_info,
-        add_data,
-        delete_document,
-    ],
-    instruction="""
-      You are an experienced construction project coordinator with comprehensive access to all project documentation, contracts, plans, reports, and site data. Your role is to help project stakeholders quickly find accurate information and make informed decisions.
-      Your Expertise
-      You have instant access to the complete project documentation through your document search capabilities. When someone asks a question, you naturally search through the relevant documents to provide accurate, detailed answers. You understand construction terminology, project workflows, safety requirements, compliance issues, and contractual obligations.
-      How You Work
-      When responding to questions, you automatically search the project documents to find the most relevant and up-to-date information. If your initial search doesn't provide complete coverage of a topic, you'll perform additional searches with different approaches to ensure you've found all pertinent details.
-      You're thorough in your research - if someone asks about a contract provision, safety protocol, or technical specification, you'll search comprehensively to provide complete context, including related requirements, deadlines, responsible parties, and any recent updates or changes.
-      Your Approach
+# Coordinator role followed by the guidelines shared by every agent in the package
+INSTRUCTION = load_prompt("coordinator") + load_prompt("guidelines")
 
-      Be conversational and helpful: Respond naturally, as if you're a knowledgeable team member who happens to have perfect recall of all project documents
-      Search comprehensively: Don't settle for partial information. If a question seems complex or multi-faceted, perform multiple searches to gather complete details
-      Provide context: When sharing information, include relevant background, implications, and connections to other project elements
-      Be precise about sources: When you find information, reference which documents or sections it comes from
-      Acknowledge limitations: If you can't find specific information after thorough searching, clearly state that it's not available in the current documentation
+# Decides whether a turn needs the documents at all
+MANAGER_INSTRUCTION = load_prompt("manager")
 
-      Available Information
-      You can access all project documents. When needed, you can also get detailed information about the document set to better understand what information is available.
-      Response Guidelines
 
-      Answer questions directly and conversationally
-      Include specific details, dates, numbers, and requirements when relevant
-      If a question touches on multiple aspects (like a contract that involves both timeline and budget), search for information on all relevant aspects
-      When appropriate, proactively mention related information that might be useful
-      If information seems incomplete or if there might be updates elsewhere in the documentation, perform additional searches to be thorough
+def _build_rag_agent() -> Agent:
+    """
+    Build the agent that searches and manages the project documents.
 
-      Remember: Your goal is to be the most knowledgeable and helpful team member anyone could ask for regarding this construction project. You have access to everything - use that capability to provide comprehensive, accurate answers that help people make better decisions and keep the project moving smoothly.
-         
-    ## Your Capabilities
-    
-    1. **Query Documents**: You can answer questions by retrieving relevant information from the document corpus.
-    2. **Get Corpus Info**: You can provide detailed information about the corpus, including file metadata and statistics.
-    3. **Add Data**: You can add new documents to the corpus.
-    4. **Delete Document**: You can delete a specific document from the corpus.
-    
-    ## How to Approach User Requests
-    
-    When a user asks a question:
-    1. If they're asking a knowledge question, use the `rag_query` tool to search the corpus.
-    2. If they want information about the corpus, use the `get_corpus_info` tool.
-    4. You must be precise and specific in your answers.
-    5. You can make multiple queries to the corpus to get the information you need.
-    6. If you think the fetched information is not enough, you can try to fetch additional information from the documents. and attempt to search for more relavent information from the documents.
-    
-    ## Using Tools
-    
-    You have four specialized tools at your disposal:
-    
-    1. `rag_query`: Query the corpus to answer questions
-       - Parameters:
-         - query: The text question to ask
-    
-    2. `get_corpus_info`: Get detailed information about the corpus
-    
-    3. `add_data`: Add new documents to the corpus
-        - Parameters:
-            - paths: List of URLs or GCS paths to add to the corpus.
-    
-    4. `delete_document`: Delete a specific document from the corpus
-        - Parameters:
-            - document_id: The ID of the specific document/file to delete.
+    Returns:
+        Agent: The RAG coordinator agent
+    """
+    return Agent(
+        name="RagSearchAgent",
+        # Using Gemini 2.5 Flash for best performance with RAG operations
+        model="gemini-2.5-flash-preview-04-17",
+    
+        description=(
+            "Answers questions from the construction project documents and adds, "
+            "deletes or lists documents in the corpus"
+        ),
+        tools=list(TOOLS),
+        instruction=INSTRUCTION,
+    )
 
-    
-    ## INTERNAL: Technical Implementation Details
-    
-    This section is NOT user-facing information - don't repeat these details to users:
-    
-    - The system uses a hardcoded corpus.
-    
-    ## Communication Guidelines
-    
-    - Be clear and concise in your responses.
-    - If querying the corpus, explain that you are using the project's document corpus.
-    - If managing documents, explain what actions you've taken.
-    - When corpus information is displayed, organize it clearly for the user.
-    - If an error occurs, explain what went wrong and suggest next steps.
-    
-    Remember, your primary goal is to help owners of the construction project to get information about the project. You must ensure that the results given are accurate and relevant to the question asked.
-    Remember, you can make multiple queries to the corpus to get the information you need. And give the user the most accurate and relevant information.
-    For example, if the user asks about a certain contract, and you query the corpus, and the information is not enough, you can try to fetch additional information from the documents. and attempt to search for more relavent information from the documents.
-    Do not make up information, and do not provide information that is not in the documents.
-    Try your best to give user grounded information. If you are unable to find the information after multiple queries, you can say that you are unable to find the information.
-    """,
-)
+
+@functools.lru_cache(maxsize=1)
+def get_root_agent() -> Agent:
+    """
+    Build the root agent on first use and return the same instance afterwards.
+
+    The root agent answers turns that do not need the documents itself and
+    transfers the rest to the RAG agent, so those turns skip embedding and search.
+
+    Returns:
+        Agent: The manager agent, with the RAG agent as its sub-agent
+    """
+    return Agent(
+        name="HMKAgent",
+        model="gemini-2.0-flash",
+        description="Vertex AI RAG Agent",
+        instruction=MANAGER_INSTRUCTION,
+        sub_agents=[_build_rag_agent()],
+    )
+
+
+def __getattr__(name):
+    # Resolve `root_agent` lazily so importing this module does not build the agent
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,26 +5,90 @@ These settings are used by the various RAG tools.
 Vertex AI initialization is performed in the package's __init__.py
 """
 
+import functools
 import os
 
 from dotenv import load_dotenv
 
-# Load environment variables (this is redundant if __init__.py is imported first,
-# but included for safety when importing config directly)
-load_dotenv()
 
-# Vertex AI settings
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
-LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
+@functools.cache
+def _load_env() -> None:
+    """
+    Load environment variables at most once per process.
+
+    The cache alone guards this, not a flag in os.environ: the root _config.py
+    loads the repository's .env under its own flag, and this one must still find
+    rag_agent/.env, which load_dotenv searches first from this file's directory.
+    """
+    load_dotenv()
+
+
+def _require_env(name: str) -> str:
+    """Return a required environment variable, failing fast if it is missing."""
+    _load_env()
+    value = os.environ.get(name)
+    if not value:
+        raise RuntimeError(f"{name} must be set")
+    return value
+
+
+# Vertex AI settings are resolved on first use rather than at import, so a .env
+# loaded after this module is imported is still picked up. A missing variable
+# raises and is not cached, so a later call can still succeed.
+@functools.cache
+def project_id() -> str:
+    """Return the Google Cloud project ID."""
+    return _require_env("GOOGLE_CLOUD_PROJECT")
+
+
+@functools.cache
+def location() -> str:
+    """Return the Google Cloud location."""
+    return _require_env("GOOGLE_CLOUD_LOCATION")
+
 
 # RAG settings
 DEFAULT_CHUNK_SIZE = 1024
 DEFAULT_CHUNK_OVERLAP = 200
 DEFAULT_TOP_K = 3
 DEFAULT_DISTANCE_THRESHOLD = 0.5
+SHORT_QUERY_WORDS = 8  # Queries with fewer words are treated as narrow lookups
+SHORT_QUERY_TOP_K = 2
+BROAD_QUERY_TOP_K = 10  # For queries asking to "list" or see "all" of something
 DEFAULT_EMBEDDING_MODEL = "publishers/google/models/text-embedding-005"
 DEFAULT_EMBEDDING_REQUESTS_PER_MIN = 1000
+DEFAULT_EMBEDDING_BURST = 50  # Requests allowed at once before throttling to the rate above
+DEFAULT_IMPORT_BATCHES_PER_MIN = 30  # import_files requests started by add_data
+DEFAULT_IMPORT_BURST = 4
+
+# Semantic cache settings for rag_query
+DEFAULT_SEMANTIC_CACHE_SIZE = 256
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_TTL = 600  # Seconds
+
+# get_corpus_info cache settings
+CORPUS_INFO_CACHE_SIZE = 32
+CORPUS_INFO_CACHE_TTL = 60  # Seconds
+
+# Record of files already imported by add_data, so unchanged files are not
+# re-parsed and re-embedded
+INGEST_CACHE_PATH = os.environ.get("RAGAGENT_INGEST_CACHE", "~/.cache/ragagent/ingest.sqlite3")
+INGEST_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds
+
+# How long the display name -> resource name map of all corpora is reused
+CORPUS_LIST_CACHE_TTL = 60  # Seconds
+
+# Speculative RAG settings
+SPECULATIVE_DRAFT_MODEL = "gemini-2.0-flash"
+DEFAULT_SPECULATIVE_K = 4
+MAX_SPECULATIVE_K = 6  # Upper bound on the model-chosen k; each variant costs a retrieval and a draft call
 
 # Default corpus settings
 DEFAULT_CORPUS_ID = "4532873024948404224"  # Your specific corpus ID
 DEFAULT_CORPUS_DISPLAY_NAME = "test"  # The display name you use
+
+
+@functools.cache
+def default_corpus_resource_name() -> str:
+    """Return the full resource name of the default corpus, built once instead of on every tool call."""
+    return f"projects/{project_id()}/locations/{location()}/ragCorpora/{DEFAULT_CORPUS_ID}"
@@ -1,16 +1,32 @@
-# Update main.py to serve the web interface
-@"
+"""
+Serve the RAG agent with the ADK web interface.
+
+Run with `python -m rag_agent.main`; the port is taken from the PORT
+environment variable (default 8080). Other servers that load the package can
+set RAGAGENT_WARMUP=1 to get the same background warm-up.
+"""
+
 import os
-from adk.python import run_agent_server
-from agent import root_agent
 
-if __name__ == "__main__":
+
+def main():
+    """Start the ADK API server with the web UI for the agents in this repository."""
+    # Imported here so `import rag_agent.main` stays cheap
+    import uvicorn
+    from google.adk.cli.fast_api import get_fast_api_app
+
+    from . import warm_up
+
+    # Resolve credentials and model clients while the server starts
+    warm_up()
+
+    # ADK discovers agents as packages inside agents_dir; rag_agent is one of them
+    agents_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    app = get_fast_api_app(agents_dir=agents_dir, web=True)
+
     port = int(os.environ.get("PORT", 8080))
-    # Enable web interface
-    run_agent_server(
-        root_agent, 
-        port=port, 
-        host="0.0.0.0",
-        serve_web_interface=True
-    )
-"@ | Out-File -FilePath "main.py" -Encoding utf8 -Force
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Prompt text for the RAG agents.
+
+Prompts are kept as `<name>_prompt.txt` files in this package and are read
+once per process.
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+PROMPT_DIR = Path(__file__).parent
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Load a prompt fragment by name.
+
+    The text is interned, so every agent built from the same fragment shares a
+    single string object.
+
+    Args:
+        name (str): Prompt name, e.g. "coordinator" for coordinator_prompt.txt
+
+    Returns:
+        str: The prompt text
+    """
+    text = (PROMPT_DIR / f"{name}_prompt.txt").read_text(encoding="utf-8")
+    return sys.intern(text)
@@ -0,0 +1,73 @@
+"""
+In-process rate limiting for Vertex AI calls.
+
+A token bucket admits requests at a steady rate with a bounded burst, so the
+tools throttle themselves instead of running into 429 errors and retries.
+"""
+
+import asyncio
+import threading
+import time
+
+from .config import (
+    DEFAULT_EMBEDDING_BURST,
+    DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
+    DEFAULT_IMPORT_BATCHES_PER_MIN,
+    DEFAULT_IMPORT_BURST,
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from both threads and coroutines."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum number of tokens, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens now and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # The balance may go negative; later callers then queue behind this one
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block the calling thread until the tokens are available."""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Wait without blocking the event loop until the tokens are available."""
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# Shared by every call that makes Vertex AI compute embeddings
+EMBED_BUCKET = TokenBucket(DEFAULT_EMBEDDING_REQUESTS_PER_MIN / 60, DEFAULT_EMBEDDING_BURST)
+
+# Paces add_data's import requests, one token per batch. Imports get their own
+# bucket, so bulk ingestion never delays queries; how fast each import embeds its
+# files is limited server-side by max_embedding_requests_per_min.
+IMPORT_BUCKET = TokenBucket(DEFAULT_IMPORT_BATCHES_PER_MIN / 60, DEFAULT_IMPORT_BURST)
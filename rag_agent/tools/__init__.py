@@ -2,18 +2,43 @@
 RAG Tools package for interacting with Vertex AI RAG corpora.
 """
 
+from google.adk.tools import FunctionTool
+
 from .add_data import add_data
 from .delete_document import delete_document
 from .get_corpus_info import get_corpus_info
-from .rag_query import rag_query
+from .rag_query import rag_query, rag_query_batch
+from .speculative_rag_query import speculative_rag_query
 from .utils import (
     get_corpus_resource_name,
 )
 
+# Agent tools by name, in the order they are offered to the model
+TOOL_REGISTRY = {
+    tool.__name__: tool
+    for tool in (
+        rag_query,
+        rag_query_batch,
+        speculative_rag_query,
+        get_corpus_info,
+        add_data,
+        delete_document,
+    )
+}
+
+# The registry's tools wrapped once as ADK FunctionTools; ADK would otherwise
+# wrap bare functions again, re-inspecting their signatures, every time the
+# agent lists its tools
+TOOLS = tuple(FunctionTool(func=tool) for tool in TOOL_REGISTRY.values())
+
 __all__ = [
     "add_data",
     "rag_query",
+    "rag_query_batch",
+    "speculative_rag_query",
     "get_corpus_info",
     "delete_document",
     "get_corpus_resource_name",
+    "TOOL_REGISTRY",
+    "TOOLS",
 ]
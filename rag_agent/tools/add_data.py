@@ -2,23 +2,92 @@
 Tool for adding new data sources to a Vertex AI RAG corpus.
 """
 
+import asyncio
+import functools
 import re
-from typing import List
+from typing import Dict, List, Optional
 
 from google.adk.tools.tool_context import ToolContext
 from vertexai import rag
 
+from .. import config
 from ..config import (
     DEFAULT_CHUNK_OVERLAP,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
 )
-from .utils import get_corpus_resource_name
+from ..ratelimit import IMPORT_BUCKET
+from .get_corpus_info import corpus_info_cache
+from .ingest_cache import INGEST_CACHE
+from .rag_query import rag_query
+from .utils import get_session_corpus_resource_name
+
+# Google Docs/Sheets/Slides or Drive URL; the file ID is captured in the group
+# named after the kind of URL, so one match tells both apart
+_PATH_RE = re.compile(
+    r"https://(?:"
+    r"docs\.google\.com/(?:document|spreadsheets|presentation)/d/(?P<docs>[a-zA-Z0-9_-]+)"
+    r"|drive\.google\.com/(?:file/d/|open\?id=)(?P<drive>[a-zA-Z0-9_-]+)"
+    r")(?:/|$)"
+)
+
+# Most paths sent in a single import request
+MAX_IMPORT_BATCH = 256
+
+
+@functools.lru_cache(maxsize=1)
+def _get_storage_client():
+    """Create the Cloud Storage client once per process."""
+    from google.cloud import storage
+
+    return storage.Client(project=config.project_id())
+
+
+def _gcs_path_info(path: str) -> Optional[str]:
+    """
+    Look up what a gs:// path names.
+
+    Returns:
+        Optional[str]: None if the path matches no objects, "" for a folder prefix,
+        or the object generation if it names a single object
+    """
+    bucket, _, prefix = path[len("gs://"):].partition("/")
+    blobs = list(_get_storage_client().list_blobs(bucket, prefix=prefix, max_results=2))
+    if not blobs:
+        return None
+    # Listings are sorted, so an object named exactly like the path comes first and
+    # anything under it as a folder comes next
+    is_object = blobs[0].name == prefix and not (
+        len(blobs) > 1 and blobs[1].name.startswith(prefix.rstrip("/") + "/")
+    )
+    return str(blobs[0].generation) if is_object else ""
+
+
+async def _check_gcs_paths(paths: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Look up every gs:// path concurrently.
+
+    Returns:
+        Dict[str, Optional[str]]: _gcs_path_info's result per gs:// path; a check that
+        failed (e.g. no list permission) counts as a folder, left for the import to report
+    """
+    gcs_paths = [path for path in paths if path.startswith("gs://")]
+    infos = await asyncio.gather(
+        *(asyncio.to_thread(_gcs_path_info, path) for path in gcs_paths),
+        return_exceptions=True,
+    )
+    return {
+        path: "" if isinstance(info, Exception) else info
+        for path, info in zip(gcs_paths, infos)
+    }
 
 
-def add_data(
+async def add_data(
     paths: List[str],
     tool_context: ToolContext,
+    force: bool = False,
+    chunk_size: int = 0,
+    chunk_overlap: int = -1,
 ) -> dict:
     """
     Add new data sources to a Vertex AI RAG corpus.
@@ -31,6 +100,12 @@ def add_data(
                           - Google Cloud Storage: "gs://{BUCKET}/{PATH}"
                           Example: ["https://drive.google.com/file/d/123", "gs://my_bucket/my_files_dir"]
         tool_context (ToolContext): The tool context
+        force (bool): Re-import Cloud Storage files even if the same version was
+                      imported recently
+        chunk_size (int): Tokens per chunk; 0 uses the configured default
+        chunk_overlap (int): Tokens shared by neighbouring chunks; -1 uses the
+                            configured default. Less overlap means fewer embeddings and less storage,
+                            more overlap can improve recall. Must be less than chunk_size.
 
     Returns:
         dict: Information about the added data and status
@@ -44,8 +119,23 @@ def add_data(
             "paths": paths,
         }
 
+    # Resolve and check the chunking settings
+    if chunk_size <= 0:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    if chunk_overlap < 0:
+        chunk_overlap = min(DEFAULT_CHUNK_OVERLAP, chunk_size // 2)
+    if chunk_overlap >= chunk_size:
+        return {
+            "status": "error",
+            "message": f"Invalid chunking: chunk_overlap ({chunk_overlap}) must be less than chunk_size ({chunk_size})",
+            "corpus_name": "hardcoded-corpus",
+            "paths": paths,
+        }
+    chunking = (chunk_size, chunk_overlap)
+
     # Pre-process paths to validate and convert Google Docs URLs to Drive format if needed
-    validated_paths = []
+    # Used as an ordered set, so paths that normalize to the same URL are imported once
+    validated_paths = {}
     invalid_paths = []
     conversions = []
 
@@ -54,40 +144,28 @@ def add_data(
             invalid_paths.append(f"{path} (Not a valid string)")
             continue
 
-        # Check for Google Docs/Sheets/Slides URLs and convert them to Drive format
-        docs_match = re.match(
-            r"https:\/\/docs\.google\.com\/(?:document|spreadsheets|presentation)\/d\/([a-zA-Z0-9_-]+)(?:\/|$)",
-            path,
-        )
-        if docs_match:
-            file_id = docs_match.group(1)
-            drive_url = f"https://drive.google.com/file/d/{file_id}/view"
-            validated_paths.append(drive_url)
-            conversions.append(f"{path} → {drive_url}")
+        # Check for GCS paths first, the cheapest test
+        if path.startswith("gs://"):
+            validated_paths.setdefault(path, None)
             continue
 
-        # Check for valid Drive URL format
-        drive_match = re.match(
-            r"https:\/\/drive\.google\.com\/(?:file\/d\/|open\?id=)([a-zA-Z0-9_-]+)(?:\/|$)",
-            path,
-        )
-        if drive_match:
-            # Normalize to the standard Drive URL format
-            file_id = drive_match.group(1)
+        match = _PATH_RE.match(path)
+        if match:
+            # Convert Docs/Sheets/Slides URLs and normalize Drive URLs to the
+            # standard Drive URL format
+            file_id = match.group(match.lastgroup)
             drive_url = f"https://drive.google.com/file/d/{file_id}/view"
-            validated_paths.append(drive_url)
+            validated_paths.setdefault(drive_url, None)
             if drive_url != path:
                 conversions.append(f"{path} → {drive_url}")
             continue
 
-        # Check for GCS paths
-        if path.startswith("gs://"):
-            validated_paths.append(path)
-            continue
-
         # If we're here, the path wasn't in a recognized format
         invalid_paths.append(f"{path} (Invalid format)")
 
+    duplicates_removed = len(paths) - len(invalid_paths) - len(validated_paths)
+    validated_paths = list(validated_paths)
+
     # Check if we have any valid paths after validation
     if not validated_paths:
         return {
@@ -98,28 +176,69 @@ def add_data(
         }
 
     try:
-        # Get the corpus resource name
-        corpus_resource_name = get_corpus_resource_name()
+        # Get the corpus resource name from the session without any lookup
+        corpus_resource_name = get_session_corpus_resource_name(tool_context.state)
 
         # Set up chunking configuration
         transformation_config = rag.TransformationConfig(
             chunking_config=rag.ChunkingConfig(
-                chunk_size=DEFAULT_CHUNK_SIZE,
-                chunk_overlap=DEFAULT_CHUNK_OVERLAP,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
             ),
         )
 
-        # Import files to the corpus
-        import_result = rag.import_files(
-            corpus_resource_name,
-            validated_paths,
-            transformation_config=transformation_config,
-            max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
-        )
+        # Drop GCS paths with nothing behind them before the import parses anything
+        gcs_info = await _check_gcs_paths(validated_paths)
+        missing = {path for path, info in gcs_info.items() if info is None}
+        if missing:
+            invalid_paths.extend(
+                f"{path} (Not found in Cloud Storage)" for path in validated_paths if path in missing
+            )
+            validated_paths = [path for path in validated_paths if path not in missing]
+
+        # Skip single Cloud Storage objects already imported at the same generation
+        # with the same chunking; re-importing them would re-parse and re-embed
+        # unchanged content. Other paths have no version to compare and always import.
+        versions = {path: info for path, info in gcs_info.items() if info}
+        already_imported = []
+        if versions and not force:
+            already_imported = await asyncio.to_thread(
+                INGEST_CACHE.imported, corpus_resource_name, versions, chunking
+            )
+        skipped = set(already_imported)
+        to_import = [path for path in validated_paths if path not in skipped]
+
+        # Import files to the corpus in batches. Starting imports is paced through
+        # the import bucket; each import paces its own embedding requests
+        # server-side through max_embedding_requests_per_min
+        files_added = 0
+        for start in range(0, len(to_import), MAX_IMPORT_BATCH):
+            batch = to_import[start:start + MAX_IMPORT_BATCH]
+            await IMPORT_BUCKET.acquire_async()
+            import_result = await asyncio.to_thread(
+                rag.import_files,
+                corpus_resource_name,
+                batch,
+                transformation_config=transformation_config,
+                max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
+            )
+            files_added += import_result.imported_rag_files_count
+            # Only remember versioned files from batches that imported cleanly
+            batch_versions = {path: versions[path] for path in batch if path in versions}
+            if batch_versions and not getattr(import_result, "failed_rag_files_count", 0):
+                await asyncio.to_thread(
+                    INGEST_CACHE.record, corpus_resource_name, batch_versions, chunking
+                )
+
+        # Cached query results and corpus info may now be stale
+        if to_import:
+            rag_query.cache_clear()
+            corpus_info_cache.pop(corpus_resource_name, None)
 
-        # Set this as the current corpus if not already set
-        if not tool_context.state.get("current_corpus"):
-            tool_context.state["current_corpus"] = "hardcoded-corpus"
+        # Set this as the current corpus unless a valid one is already set; the full
+        # resource name lets later tools resolve it without a lookup
+        if tool_context.state.get("current_corpus") != corpus_resource_name:
+            tool_context.state["current_corpus"] = corpus_resource_name
 
         # Build the success message
         conversion_msg = ""
@@ -128,9 +247,13 @@ def add_data(
 
         return {
             "status": "success",
-            "message": f"Successfully added {import_result.imported_rag_files_count} file(s) to corpus 'hardcoded-corpus'{conversion_msg}",
+            "message": f"Successfully added {files_added} file(s) to corpus 'hardcoded-corpus'{conversion_msg}",
             "corpus_name": "hardcoded-corpus",
-            "files_added": import_result.imported_rag_files_count,
+            "files_added": files_added,
+            "duplicates_removed": duplicates_removed,
+            "already_imported": already_imported,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
             "paths": validated_paths,
             "invalid_paths": invalid_paths,
             "conversions": conversions,
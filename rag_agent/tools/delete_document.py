@@ -2,13 +2,18 @@
 Tool for deleting a specific document from a Vertex AI RAG corpus.
 """
 
+import asyncio
+
 from google.adk.tools.tool_context import ToolContext
 from vertexai import rag
 
-from .utils import get_corpus_resource_name
+from .get_corpus_info import corpus_info_cache
+from .ingest_cache import INGEST_CACHE
+from .rag_query import rag_query
+from .utils import get_session_corpus_resource_name
 
 
-def delete_document(
+async def delete_document(
     document_id: str,
     tool_context: ToolContext,
 ) -> dict:
@@ -24,12 +29,19 @@ def delete_document(
         dict: Status information about the deletion operation
     """
     try:
-        # Get the corpus resource name
-        corpus_resource_name = get_corpus_resource_name()
+        # Get the corpus resource name, preferring a valid current corpus in the session
+        corpus_resource_name = get_session_corpus_resource_name(tool_context.state)
 
         # Delete the document
         rag_file_path = f"{corpus_resource_name}/ragFiles/{document_id}"
-        rag.delete_file(rag_file_path)
+        await asyncio.to_thread(rag.delete_file, rag_file_path)
+
+        # Cached query results and corpus info may now be stale, and the deleted
+        # file must be importable again; only its ID is known, so forget the
+        # corpus's recorded imports
+        rag_query.cache_clear()
+        corpus_info_cache.pop(corpus_resource_name, None)
+        await asyncio.to_thread(INGEST_CACHE.clear, corpus_resource_name)
 
         return {
             "status": "success",
@@ -2,13 +2,21 @@
 Tool for retrieving detailed information about a specific RAG corpus.
 """
 
+import asyncio
+
+from cachetools import TTLCache
 from google.adk.tools.tool_context import ToolContext
 from vertexai import rag
 
+from ..config import CORPUS_INFO_CACHE_SIZE, CORPUS_INFO_CACHE_TTL
 from .utils import get_corpus_resource_name
 
+# Results keyed by corpus resource name; the corpus only changes through
+# add_data and delete_document, which pop their entry
+corpus_info_cache = TTLCache(maxsize=CORPUS_INFO_CACHE_SIZE, ttl=CORPUS_INFO_CACHE_TTL)
+
 
-def get_corpus_info(
+async def get_corpus_info(
     tool_context: ToolContext,
 ) -> dict:
     """
@@ -24,14 +32,20 @@ def get_corpus_info(
         # Get the corpus resource name
         corpus_resource_name = get_corpus_resource_name()
 
+        cached = corpus_info_cache.get(corpus_resource_name)
+        if cached is not None:
+            return cached
+
         # Try to get corpus details first
         corpus_display_name = "hardcoded-corpus"  # Default if we can't get actual display name
 
         # Process file information
         file_details = []
+        listed = False
         try:
-            # Get the list of files
-            files = rag.list_files(corpus_resource_name)
+            # Get the list of files; paging through the results blocks, so it runs
+            # in a worker thread
+            files = await asyncio.to_thread(lambda: list(rag.list_files(corpus_resource_name)))
             for rag_file in files:
                 # Get document specific details
                 try:
@@ -66,12 +80,13 @@ def get_corpus_info(
                 except Exception:
                     # Continue to the next file
                     continue
+            listed = True
         except Exception:
             # Continue without file details
             pass
 
         # Basic corpus info
-        return {
+        result = {
             "status": "success",
             "message": f"Successfully retrieved information for corpus '{corpus_display_name}'",
             "corpus_name": "hardcoded-corpus",
@@ -80,6 +95,11 @@ def get_corpus_info(
             "files": file_details,
         }
 
+        # A failed listing would otherwise be served as an empty corpus
+        if listed:
+            corpus_info_cache[corpus_resource_name] = result
+        return result
+
     except Exception as e:
         return {
             "status": "error",
@@ -0,0 +1,124 @@
+"""
+On-disk record of files already imported into a corpus.
+
+Importing a file again re-parses and re-embeds it even when nothing changed.
+add_data records each successfully imported file together with its content
+version (the Cloud Storage object generation) and the chunking and embedding
+settings it was imported with, and skips files recorded within the TTL unless
+asked to force a re-import. Paths without a version, such as Drive URLs and
+gs:// folders, are never recorded, since their content can change unseen.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from ..config import (
+    DEFAULT_EMBEDDING_MODEL,
+    INGEST_CACHE_PATH,
+    INGEST_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestCache:
+    """Thread-safe SQLite set of (corpus, path, version, settings) keys with an import time."""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self._conn = None  # opened on first use
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS imports "
+                "(key TEXT PRIMARY KEY, corpus TEXT NOT NULL, imported_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS imports_corpus ON imports (corpus)")
+        return self._conn
+
+    @staticmethod
+    def _key(corpus_resource_name: str, path: str, version: str, chunking: tuple) -> str:
+        chunk_size, chunk_overlap = chunking
+        settings = (
+            f"{corpus_resource_name}\0{path}\0{version}\0{chunk_size}\0"
+            f"{chunk_overlap}\0{DEFAULT_EMBEDDING_MODEL}"
+        )
+        return hashlib.blake2b(settings.encode("utf-8"), digest_size=16).hexdigest()
+
+    def imported(
+        self, corpus_resource_name: str, versions: Dict[str, str], chunking: tuple
+    ) -> List[str]:
+        """
+        Return the paths recorded as imported into the corpus within the TTL.
+
+        Args:
+            corpus_resource_name (str): The corpus the paths were imported into
+            versions (Dict[str, str]): The content version of each path to check
+            chunking (tuple): The (chunk_size, chunk_overlap) used for the import
+
+        Returns:
+            List[str]: The paths that were already imported, in input order
+        """
+        cutoff = time.time() - self.ttl
+        try:
+            with self._lock:
+                conn = self._connect()
+                return [
+                    path
+                    for path, version in versions.items()
+                    if conn.execute(
+                        "SELECT 1 FROM imports WHERE key = ? AND imported_at >= ?",
+                        (self._key(corpus_resource_name, path, version, chunking), cutoff),
+                    ).fetchone()
+                ]
+        except (OSError, sqlite3.Error) as e:
+            # The cache is only an optimization; import everything instead
+            logger.warning(f"Ingest cache unavailable: {str(e)}")
+            return []
+
+    def record(
+        self, corpus_resource_name: str, versions: Dict[str, str], chunking: tuple
+    ) -> None:
+        """Record paths at the given content versions as imported into the corpus now."""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO imports (key, corpus, imported_at) VALUES (?, ?, ?)",
+                        [
+                            (
+                                self._key(corpus_resource_name, path, version, chunking),
+                                corpus_resource_name,
+                                now,
+                            )
+                            for path, version in versions.items()
+                        ],
+                    )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not record imports in the ingest cache: {str(e)}")
+
+    def clear(self, corpus_resource_name: str) -> None:
+        """Forget the imports recorded for a corpus, e.g. after a document was deleted from it."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM imports WHERE corpus = ?", (corpus_resource_name,))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not clear the ingest cache: {str(e)}")
+
+
+# Shared by add_data and delete_document
+INGEST_CACHE = IngestCache(INGEST_CACHE_PATH, INGEST_CACHE_TTL)
@@ -2,21 +2,42 @@
 Tool for querying Vertex AI RAG corpora and retrieving relevant information.
 """
 
+import asyncio
 import logging
+from typing import List
 
 from google.adk.tools.tool_context import ToolContext
 from vertexai import rag
 
 from ..config import (
+    BROAD_QUERY_TOP_K,
     DEFAULT_DISTANCE_THRESHOLD,
     DEFAULT_TOP_K,
+    SHORT_QUERY_TOP_K,
+    SHORT_QUERY_WORDS,
 )
+from ..ratelimit import EMBED_BUCKET
+from .semantic_cache import embed_queries, semantic_cache
 from .utils import get_corpus_resource_name
 
 
-def rag_query(
+def _choose_top_k(query: str) -> int:
+    """Pick how many chunks to retrieve from the shape of the query."""
+    words = query.lower().split()
+    # Broad requests need enough recall in one shot to avoid a second retrieval
+    if "list" in words or "all" in words:
+        return BROAD_QUERY_TOP_K
+    if len(words) < SHORT_QUERY_WORDS:
+        return SHORT_QUERY_TOP_K
+    return DEFAULT_TOP_K
+
+
+@semantic_cache()
+async def rag_query(
     query: str,
     tool_context: ToolContext,
+    top_k: int = 0,
+    distance_threshold: float = DEFAULT_DISTANCE_THRESHOLD,
 ) -> dict:
     """
     Query a Vertex AI RAG corpus with a user question and return relevant information.
@@ -24,6 +45,10 @@ def rag_query(
     Args:
         query (str): The text query to search for in the corpus
         tool_context (ToolContext): The tool context
+        top_k (int): Number of chunks to retrieve; 0 picks it from the query, with
+            more chunks for broad "list"/"all" questions and fewer for short lookups
+        distance_threshold (float): Maximum vector distance of a chunk to be returned;
+            raise it to find looser matches
 
     Returns:
         dict: The query results and status
@@ -33,14 +58,19 @@ def rag_query(
         corpus_resource_name = get_corpus_resource_name()
 
         # Configure retrieval parameters
+        if top_k <= 0:
+            top_k = _choose_top_k(query)
         rag_retrieval_config = rag.RagRetrievalConfig(
-            top_k=DEFAULT_TOP_K,
-            filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
+            top_k=top_k,
+            filter=rag.Filter(vector_distance_threshold=distance_threshold),
         )
 
-        # Perform the query
+        # Perform the query; the corpus embeds the query text, so it counts
+        # against the embedding rate limit
         print("Performing retrieval query...")
-        response = rag.retrieval_query(
+        await EMBED_BUCKET.acquire_async()
+        response = await asyncio.to_thread(
+            rag.retrieval_query,
             rag_resources=[
                 rag.RagResource(
                     rag_corpus=corpus_resource_name,
@@ -97,3 +127,78 @@ def rag_query(
             "query": query,
             "corpus_name": "hardcoded-corpus",
         }
+
+
+# Largest number of texts the embeddings API accepts in one request
+MAX_EMBEDDING_BATCH = 250
+
+
+async def rag_query_batch(
+    queries: List[str],
+    tool_context: ToolContext,
+) -> dict:
+    """
+    Query a Vertex AI RAG corpus with several related questions in one call.
+
+    Use this instead of several sequential rag_query calls when you need multiple
+    pieces of information. The queries are embedded together to check the cache,
+    and the remaining ones are retrieved in parallel.
+
+    Args:
+        queries (List[str]): The text queries to search for in the corpus
+        tool_context (ToolContext): The tool context
+
+    Returns:
+        dict: One rag_query result per query, in the order given
+    """
+    if not queries or not all(isinstance(query, str) for query in queries):
+        return {
+            "status": "error",
+            "message": "Invalid queries: Please provide a list of query strings",
+            "queries": queries,
+            "corpus_name": "hardcoded-corpus",
+        }
+
+    # Repeated queries are looked up once
+    unique_queries = list(dict.fromkeys(queries))
+    cache = rag_query.cache
+
+    # Probe the semantic cache with a single batched embedding request per 250 queries
+    embeddings = None
+    try:
+        embeddings = []
+        for start in range(0, len(unique_queries), MAX_EMBEDDING_BATCH):
+            batch = unique_queries[start:start + MAX_EMBEDDING_BATCH]
+            embeddings.extend(await asyncio.to_thread(embed_queries, batch))
+    except Exception as e:
+        logging.warning(f"Semantic cache disabled for this batch: {str(e)}")
+        embeddings = None
+
+    results = {}
+    misses = []
+    for i, query in enumerate(unique_queries):
+        cached = cache.get(embeddings[i]) if embeddings is not None else None
+        if cached is not None:
+            results[query] = {**cached, "query": query}
+        else:
+            misses.append(i)
+
+    # Retrieve everything that was not cached in parallel, bypassing the per-query
+    # embedding done by the cached rag_query
+    fetched = await asyncio.gather(
+        *(rag_query.__wrapped__(unique_queries[i], tool_context) for i in misses)
+    )
+    for i, result in zip(misses, fetched):
+        query = unique_queries[i]
+        results[query] = result
+        if embeddings is not None and result.get("status") == "success":
+            cache.put(query, embeddings[i], result)
+
+    return {
+        "status": "success",
+        "message": f"Successfully queried corpus 'hardcoded-corpus' with {len(unique_queries)} queries",
+        "corpus_name": "hardcoded-corpus",
+        "queries_count": len(unique_queries),
+        "cache_hits": len(unique_queries) - len(misses),
+        "results": [results[query] for query in unique_queries],
+    }
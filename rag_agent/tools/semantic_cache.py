@@ -0,0 +1,199 @@
+"""
+Semantic cache for RAG query tools.
+
+Queries are embedded and compared against recently answered queries; a query
+whose embedding is close enough to a cached one reuses that result instead of
+running another retrieval against the corpus.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from ..config import (
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_SEMANTIC_CACHE_SIZE,
+    DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+)
+from ..ratelimit import EMBED_BUCKET
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def get_embedding_model():
+    """Load the query embedding model once per process."""
+    from vertexai.language_models import TextEmbeddingModel
+
+    return TextEmbeddingModel.from_pretrained(DEFAULT_EMBEDDING_MODEL)
+
+
+def embed_queries(queries: List[str]) -> np.ndarray:
+    """
+    Embed several queries in a single request and return them as unit-length rows.
+
+    Args:
+        queries (List[str]): The query texts, at most 250 per request
+
+    Returns:
+        np.ndarray: One normalized embedding per query, in input order
+    """
+    from vertexai.language_models import TextEmbeddingInput
+
+    EMBED_BUCKET.acquire()
+    embeddings = get_embedding_model().get_embeddings(
+        [TextEmbeddingInput(query, "RETRIEVAL_QUERY") for query in queries]
+    )
+    vectors = np.asarray([embedding.values for embedding in embeddings], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def embed_query(query: str) -> np.ndarray:
+    """
+    Embed a query and return it as a unit-length vector.
+
+    Args:
+        query (str): The query text
+
+    Returns:
+        np.ndarray: The normalized query embedding
+    """
+    return embed_queries([query])[0]
+
+
+class SemanticCache:
+    """Thread-safe LRU cache of results keyed by query embedding similarity."""
+
+    def __init__(self, maxsize: int, threshold: float, ttl: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        # Each entry owns a fixed row of the embedding matrix, so reordering the LRU
+        # on a hit never touches the matrix
+        self._entries = OrderedDict()  # (query, tag) -> (slot, result, stored_at), LRU order
+        self._keys = [None] * maxsize  # slot -> key of the entry using it
+        self._matrix = None  # maxsize x dim, allocated on the first put
+        self._free = list(range(maxsize - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def _drop(self, key) -> None:
+        slot, _, _ = self._entries.pop(key)
+        self._keys[slot] = None
+        self._matrix[slot] = 0.0  # an empty row never reaches the threshold
+        self._free.append(slot)
+
+    def get(self, embedding: np.ndarray, tag: tuple = ()) -> Optional[dict]:
+        """
+        Return the result for the most similar cached query, if it is similar enough.
+
+        Only entries stored with the same tag, i.e. the same call parameters, and
+        younger than the TTL match.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+
+            # Embeddings are unit length, so the dot product is the cosine similarity
+            similarities = self._matrix @ embedding
+            candidates = np.flatnonzero(similarities >= self.threshold)
+            cutoff = time.monotonic() - self.ttl
+            for slot in candidates[np.argsort(-similarities[candidates])]:
+                key = self._keys[slot]
+                if key is None or key[1] != tag:
+                    continue
+                _, result, stored_at = self._entries[key]
+                if stored_at < cutoff:
+                    self._drop(key)
+                    continue
+                self._entries.move_to_end(key)
+                return result
+            return None
+
+    def put(self, query: str, embedding: np.ndarray, result: dict, tag: tuple = ()) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.float32)
+            key = (query, tag)
+            if key in self._entries:
+                self._drop(key)
+            elif not self._free:
+                self._drop(next(iter(self._entries)))
+            slot = self._free.pop()
+            self._matrix[slot] = embedding
+            self._keys[slot] = key
+            self._entries[key] = (slot, result, time.monotonic())
+
+    def clear(self) -> None:
+        """Drop every cached result, e.g. after the corpus has changed."""
+        with self._lock:
+            self._entries.clear()
+            self._keys = [None] * self.maxsize
+            self._free = list(range(self.maxsize - 1, -1, -1))
+            if self._matrix is not None:
+                self._matrix[:] = 0.0
+
+
+def _cache_tag(kwargs: dict) -> tuple:
+    """Build the cache tag from a call's keyword arguments, ignoring the tool context."""
+    return tuple(sorted((k, v) for k, v in kwargs.items() if k != "tool_context"))
+
+
+def semantic_cache(
+    maxsize: int = DEFAULT_SEMANTIC_CACHE_SIZE,
+    threshold: float = DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+    ttl: float = DEFAULT_SEMANTIC_CACHE_TTL,
+) -> Callable:
+    """
+    Cache a query tool's successful results by semantic similarity of the query.
+
+    The wrapped coroutine function keeps its signature and docstring, so it can
+    still be registered as an ADK tool. Results are only reused for calls with the
+    same keyword arguments. The cache is exposed as its `cache` attribute; call
+    `cache_clear()` on it to invalidate the cache.
+
+    Args:
+        maxsize (int): Maximum number of cached queries
+        threshold (float): Minimum cosine similarity for a cached result to be reused
+        ttl (float): Seconds a cached result may be reused
+
+    Returns:
+        Callable: A decorator for async functions taking `query` as their first argument
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = SemanticCache(maxsize, threshold, ttl)
+
+        @functools.wraps(func)
+        async def wrapper(query: str, *args, **kwargs) -> dict:
+            try:
+                embedding = await asyncio.to_thread(embed_query, query)
+            except Exception as e:
+                # Embedding is only an optimization; fall back to the real query
+                logger.warning(f"Semantic cache disabled for this query: {str(e)}")
+                return await func(query, *args, **kwargs)
+
+            tag = _cache_tag(kwargs)
+            cached = cache.get(embedding, tag)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for query: {query}")
+                return {**cached, "query": query}
+
+            result = await func(query, *args, **kwargs)
+            # Only successful lookups are worth reusing
+            if result.get("status") == "success":
+                cache.put(query, embedding, result, tag)
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
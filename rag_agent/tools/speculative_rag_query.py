@@ -0,0 +1,166 @@
+"""
+Tool for answering a question with Speculative RAG.
+
+The question is rewritten into several diversified sub-queries, which are
+retrieved in parallel; a small model then drafts one answer per retrieved
+context set in parallel, and the drafts are returned ranked by confidence
+together with the contexts they were based on.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+from typing import List
+
+from google.adk.tools.tool_context import ToolContext
+
+from .. import config
+from ..config import (
+    DEFAULT_SPECULATIVE_K,
+    MAX_SPECULATIVE_K,
+    SPECULATIVE_DRAFT_MODEL,
+)
+from .rag_query import rag_query_batch
+
+REWRITE_PROMPT = """Rewrite the question below into {k} different search queries for a
+construction project document corpus. Cover different aspects and phrasings of
+the question. Return a JSON list of {k} strings and nothing else.
+
+Question: {query}"""
+
+DRAFT_PROMPT = """Answer the question using only the context passages below. If the
+passages do not contain the answer, say so. Return a JSON object with the keys
+"answer" (string) and "confidence" (number from 0 to 1, how well the passages
+support the answer).
+
+Question: {query}
+
+Context:
+{context}"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_genai_client():
+    """Create the Gemini client once per process."""
+    from google import genai
+
+    return genai.Client(vertexai=True, project=config.project_id(), location=config.location())
+
+
+async def _generate_json(prompt: str):
+    """Run a prompt on the draft model and parse its JSON response."""
+    from google.genai import types
+
+    response = await get_genai_client().aio.models.generate_content(
+        model=SPECULATIVE_DRAFT_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(response_mime_type="application/json"),
+    )
+    return json.loads(response.text)
+
+
+async def _rewrite_query(query: str, k: int) -> List[str]:
+    """Rewrite a question into up to k diversified sub-queries, keeping the original first."""
+    try:
+        rewrites = await _generate_json(REWRITE_PROMPT.format(k=k, query=query))
+        if not isinstance(rewrites, list):
+            rewrites = []
+        sub_queries = [query] + [q for q in rewrites if isinstance(q, str) and q.strip()]
+    except Exception as e:
+        logging.warning(f"Query rewrite failed, using the original query only: {str(e)}")
+        sub_queries = [query]
+    return list(dict.fromkeys(sub_queries))[:k]
+
+
+async def _draft_answer(query: str, contexts: List[dict]) -> dict:
+    """Draft an answer from one set of retrieved contexts."""
+    context = "\n\n".join(
+        f"[{ctx['source_name']}] {ctx['text']}" for ctx in contexts
+    )
+    try:
+        draft = await _generate_json(DRAFT_PROMPT.format(query=query, context=context))
+        return {
+            "answer": str(draft.get("answer", "")),
+            "confidence": float(draft.get("confidence", 0.0)),
+        }
+    except Exception as e:
+        return {"answer": "", "confidence": 0.0, "error": str(e)}
+
+
+async def speculative_rag_query(
+    query: str,
+    tool_context: ToolContext,
+    k: int = DEFAULT_SPECULATIVE_K,
+) -> dict:
+    """
+    Answer a question by searching the corpus with several query variants at once
+    and drafting an answer from each set of results.
+
+    Call this once for questions that would otherwise need repeated searches; it
+    returns draft answers ranked by confidence along with the supporting contexts.
+
+    Args:
+        query (str): The question to answer from the corpus
+        tool_context (ToolContext): The tool context
+        k (int): Number of query variants to search and drafts to produce, at most 6
+
+    Returns:
+        dict: Ranked draft answers, their sub-queries and the retrieved contexts
+    """
+    try:
+        sub_queries = await _rewrite_query(query, min(max(1, k), MAX_SPECULATIVE_K))
+        batch = await rag_query_batch(sub_queries, tool_context)
+        retrievals = batch.get("results", [])
+
+        # Draft one answer per sub-query that found something, all in parallel
+        with_results = [r for r in retrievals if r.get("results")]
+        if not with_results:
+            return {
+                "status": "warning",
+                "message": f"No results found in corpus 'hardcoded-corpus' for query: '{query}'",
+                "query": query,
+                "sub_queries": sub_queries,
+                "corpus_name": "hardcoded-corpus",
+                "drafts": [],
+                "contexts": [],
+            }
+        drafts = await asyncio.gather(
+            *(_draft_answer(query, r["results"]) for r in with_results)
+        )
+        ranked = sorted(
+            (
+                {**draft, "sub_query": r["query"]}
+                for draft, r in zip(drafts, with_results)
+            ),
+            key=lambda draft: draft["confidence"],
+            reverse=True,
+        )
+
+        # Merge the contexts, keeping the closest match (lowest distance) for each
+        merged = {}
+        for r in with_results:
+            for ctx in r["results"]:
+                key = (ctx["source_uri"], ctx["text"])
+                if key not in merged or ctx["score"] < merged[key]["score"]:
+                    merged[key] = ctx
+
+        return {
+            "status": "success",
+            "message": f"Drafted {len(ranked)} answer(s) from {len(sub_queries)} queries against corpus 'hardcoded-corpus'",
+            "query": query,
+            "sub_queries": sub_queries,
+            "corpus_name": "hardcoded-corpus",
+            "drafts": ranked,
+            "contexts": sorted(merged.values(), key=lambda ctx: ctx["score"]),
+        }
+
+    except Exception as e:
+        error_msg = f"Error running speculative query: {str(e)}"
+        logging.error(error_msg)
+        return {
+            "status": "error",
+            "message": error_msg,
+            "query": query,
+            "corpus_name": "hardcoded-corpus",
+        }
@@ -3,14 +3,13 @@ Utility functions for the RAG tools.
 """
 
 import logging
-import re
 
-from google.adk.tools.tool_context import ToolContext
+from cachetools import TTLCache
 from vertexai import rag
 
+from .. import config
 from ..config import (
-    LOCATION,
-    PROJECT_ID,
+    CORPUS_LIST_CACHE_TTL,
     DEFAULT_CORPUS_ID,
     DEFAULT_CORPUS_DISPLAY_NAME,
 )
@@ -18,5 +17,102 @@ from ..config import (
 logger = logging.getLogger(__name__)
 
 
-def get_corpus_resource_name() -> str:
-    return "projects/gen-lang-client-0516570023/locations/us-central1/ragCorpora/4532873024948404224"
+def _is_corpus_resource_name(name: str) -> bool:
+    """Check for a full corpus resource name, e.g. projects/p/locations/l/ragCorpora/123."""
+    # Cheap string tests reject almost everything before the split
+    if not (name.startswith("projects/") and name.count("/") == 5 and "/ragCorpora/" in name):
+        return False
+    _, project, locations, location, corpora, corpus_id = name.split("/")
+    return (
+        locations == "locations"
+        and corpora == "ragCorpora"
+        and all((project, location, corpus_id))
+    )
+
+# Characters allowed in a corpus ID; everything else becomes "_"
+_ID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+
+class _SanitizeTable(dict):
+    """str.translate table mapping every disallowed code point to "_", filled on first sight."""
+
+    def __missing__(self, code: int) -> int:
+        value = code if chr(code) in _ID_CHARS else ord("_")
+        self[code] = value
+        return value
+
+
+_SANITIZE_TABLE = _SanitizeTable()
+
+# Holds a single entry, the display name -> resource name map of all corpora
+_corpora_cache = TTLCache(maxsize=1, ttl=CORPUS_LIST_CACHE_TTL)
+
+
+def _list_corpora_cached() -> dict:
+    """
+    Map corpus display names to resource names, listing the corpora at most once per TTL.
+
+    Returns:
+        dict: Resource names keyed by display name
+    """
+    corpora = _corpora_cache.get("corpora")
+    if corpora is None:
+        corpora = {}
+        for corpus in rag.list_corpora():
+            # Keep the first corpus listed under a display name, as a linear scan would
+            corpora.setdefault(getattr(corpus, "display_name", None), corpus.name)
+        _corpora_cache["corpora"] = corpora
+    return corpora
+
+
+def get_corpus_resource_name(corpus_name: str = "") -> str:
+    """
+    Convert a corpus name, ID or display name into a full resource name.
+
+    The default corpus (no name, its ID or its display name) is answered from
+    a cached value without any API call.
+
+    Args:
+        corpus_name (str): The corpus ID, display name or full resource name
+
+    Returns:
+        str: The full resource name of the corpus
+    """
+    if corpus_name in ("", DEFAULT_CORPUS_ID, DEFAULT_CORPUS_DISPLAY_NAME):
+        return config.default_corpus_resource_name()
+
+    # Already a full resource name
+    if _is_corpus_resource_name(corpus_name):
+        return corpus_name
+
+    # Look the name up among the existing corpora by display name
+    try:
+        resource_name = _list_corpora_cached().get(corpus_name)
+        if resource_name:
+            return resource_name
+    except Exception as e:
+        logger.warning(f"Error when checking for corpus display name: {str(e)}")
+
+    # Otherwise treat the last path segment as a corpus ID
+    corpus_id = corpus_name.split("/")[-1]
+    corpus_id = corpus_id.translate(_SANITIZE_TABLE)
+    return f"projects/{config.project_id()}/locations/{config.location()}/ragCorpora/{corpus_id}"
+
+
+def get_session_corpus_resource_name(state) -> str:
+    """
+    Return the corpus recorded as current in the session state.
+
+    Only a full resource name is trusted; anything else, such as a placeholder
+    left by older sessions, falls back to the default corpus the query tools read.
+
+    Args:
+        state: The tool context's session state
+
+    Returns:
+        str: The full resource name of the session's corpus
+    """
+    current_corpus = state.get("current_corpus") or ""
+    if _is_corpus_resource_name(current_corpus):
+        return current_corpus
+    return config.default_corpus_resource_name()
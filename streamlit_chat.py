@@ -1,7 +1,7 @@
 import streamlit as st
 import os
 import sys
-import ast
+import json
 from dotenv import load_dotenv
 import vertexai
 from vertexai import agent_engines
@@ -42,7 +42,7 @@ def create_chat_session(_remote_app):
     return _remote_app.create_session(user_id="streamlit_user")
 
 def send_query(remote_app, session_id, message):
-    """Send a query and get the parsed text response."""
+    """Send a query and yield the response text as it streams in."""
     try:
         response_stream = remote_app.stream_query(
             user_id="streamlit_user",
@@ -50,21 +50,21 @@ def send_query(remote_app, session_id, message):
             message=message,
         )
         
-        text_response = ""
-        for event_str in response_stream:
-            try:
-                event = ast.literal_eval(str(event_str))
-                if isinstance(event, dict) and 'content' in event and 'parts' in event['content']:
-                    for part in event['content']['parts']:
-                        if 'text' in part:
-                            text_response += part['text']
-            except (ValueError, SyntaxError):
+        for event in response_stream:
+            # Events arrive as dicts; only fall back to parsing for JSON strings
+            if isinstance(event, str):
+                try:
+                    event = json.loads(event)
+                except ValueError:
+                    continue
+            if not isinstance(event, dict):
                 continue
-        
-        return text_response if text_response else "No text response found."
+            for part in (event.get('content') or {}).get('parts', ()):
+                if 'text' in part:
+                    yield part['text']
 
     except Exception as e:
-        return f"Error: {str(e)}"
+        yield f"Error: {str(e)}"
 
 # --- Streamlit App ---
 
@@ -105,10 +105,12 @@ if prompt := st.chat_input("What would you like to know?"):
     with st.chat_message("user"):
         st.markdown(prompt)
 
-    # Get agent response
+    # Get agent response, rendering the text as it arrives
     with st.chat_message("assistant"):
         with st.spinner("Agent is thinking..."):
-            response = send_query(remote_app, st.session_state.session_id, prompt)
+            response = st.write_stream(send_query(remote_app, st.session_state.session_id, prompt))
+        if not response:
+            response = "No text response found."
             st.markdown(response)
     
     # Add agent response to history